@@ -0,0 +1,316 @@
+import asyncio
+import functools
+import inspect
+from concurrent.futures import Executor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Hashable, List, Tuple, Union
+from datetime import datetime
+import pandas as pd
+
+from .MultiOhlcvAnalyser import MultiOhlcvAnalyser
+from .utils.cache import copy_result, get_result_key
+
+
+class _ReadWriteGate:
+    """
+    Lets any number of queries run together, or a single append alone.
+    Waiting appends hold back new queries, so they cannot be starved.
+    """
+
+    def __init__(self) -> None:
+        self._condition = asyncio.Condition()
+        self._readers = 0
+        self._writing = False
+        self._waiting_writers = 0
+
+    @asynccontextmanager
+    async def reading(self) -> AsyncIterator[None]:
+        async with self._condition:
+            await self._condition.wait_for(
+                lambda: not self._writing and not self._waiting_writers
+            )
+            self._readers += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._readers -= 1
+                self._condition.notify_all()
+
+    @asynccontextmanager
+    async def writing(self) -> AsyncIterator[None]:
+        async with self._condition:
+            self._waiting_writers += 1
+            try:
+                await self._condition.wait_for(
+                    lambda: not self._writing and not self._readers
+                )
+            finally:
+                self._waiting_writers -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_signature(method: str) -> inspect.Signature:
+    """
+    Get the signature of a MultiOhlcvAnalyser method.
+
+    Args:
+        method (str): The method name.
+
+    Returns:
+        inspect.Signature: The method signature, including self.
+    """
+    return inspect.signature(getattr(MultiOhlcvAnalyser, method))
+
+
+class AsyncMultiOhlcvAnalyser:
+    def __init__(
+        self,
+        multi_ohlcv: Union[pd.DataFrame, MultiOhlcvAnalyser],
+        executor: Executor = None,
+        **kwargs,
+    ) -> None:
+        """
+        Initialize the AsyncMultiOhlcvAnalyser class.
+
+        Every query runs a `MultiOhlcvAnalyser` method on a thread executor,
+        so it does not block the event loop. Identical queries in flight,
+        i.e. the same method, arguments and date range, share a single
+        computation. Queries run concurrently with each other, while `append`
+        waits for the running queries and holds back new ones.
+
+        Parameters:
+        - multi_ohlcv (Union[pd.DataFrame, MultiOhlcvAnalyser]): The multi-ohlcv data, or an analyser that is no longer used directly.
+        - executor (Executor): The thread executor running the queries. Default is None for the event loop's default executor.
+        - **kwargs: The keyword arguments of `MultiOhlcvAnalyser`, e.g. cache_size or prefix_index.
+
+        Returns:
+        None
+        """
+        if isinstance(multi_ohlcv, MultiOhlcvAnalyser):
+            self.analyser = multi_ohlcv
+        else:
+            self.analyser = MultiOhlcvAnalyser(multi_ohlcv, **kwargs)
+        self._executor = executor
+        self._in_flight: Dict[Tuple[Hashable, ...], asyncio.Task] = {}
+        self._gate = _ReadWriteGate()
+
+    async def _run(self, method: str, *args, **kwargs) -> Any:
+        """
+        Run an analyser method on the executor.
+
+        Parameters:
+        - method (str): The method name.
+        - *args: The positional arguments.
+        - **kwargs: The keyword arguments.
+
+        Returns:
+        Any: The result of the method.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            functools.partial(getattr(self.analyser, method), *args, **kwargs),
+        )
+
+    async def _query(self, method: str, *args, **kwargs) -> Any:
+        """
+        Run a query, or join the identical query already in flight.
+
+        The shared computation is shielded, so a cancelled caller does not
+        cancel it for the others, and every caller receives its own copy of
+        the result.
+
+        Parameters:
+        - method (str): The method name.
+        - *args: The positional arguments.
+        - **kwargs: The keyword arguments.
+
+        Returns:
+        Any: The result of the method.
+        """
+        key = get_result_key(method, _get_signature(method), args, kwargs)
+        task = self._in_flight.get(key)
+        if task is not None:
+            return copy_result(await asyncio.shield(task))
+
+        async def compute() -> Any:
+            try:
+                async with self._gate.reading():
+                    return await self._run(method, *args, **kwargs)
+            finally:
+                del self._in_flight[key]
+
+        task = asyncio.ensure_future(compute())
+        self._in_flight[key] = task
+        return copy_result(await asyncio.shield(task))
+
+    def in_flight(self) -> int:
+        """
+        Get the number of distinct queries being computed.
+
+        Returns:
+        int: The number of queries in flight.
+        """
+        return len(self._in_flight)
+
+    def cache_info(self) -> Dict[str, int]:
+        """
+        Get the statistics of the result cache of the analyser.
+
+        Returns:
+        Dict[str, int]: The hits, misses, number of results, maxsize and size in bytes, or None without a cache.
+        """
+        return self.analyser.cache_info()
+
+    async def append(self, new_bars: pd.DataFrame) -> None:
+        """
+        Append new bars once the running queries are done, see
+        `MultiOhlcvAnalyser.append`.
+
+        Parameters:
+        - new_bars (pd.DataFrame): The new multi-ohlcv bars.
+
+        Returns:
+        None
+        """
+        async with self._gate.writing():
+            await self._run("append", new_bars)
+
+    async def info(
+        self,
+        start: Union[str, datetime] = None,
+        end: Union[str, datetime] = None,
+    ) -> pd.DataFrame:
+        """
+        See `MultiOhlcvAnalyser.info`.
+        """
+        return await self._query("info", start, end)
+
+    async def coef(
+        self,
+        arg: str,
+        start: Union[str, datetime] = None,
+        end: Union[str, datetime] = None,
+    ) -> pd.Series:
+        """
+        See `MultiOhlcvAnalyser.coef`.
+        """
+        return await self._query("coef", arg, start, end)
+
+    async def normalized_coef(
+        self,
+        arg: str,
+        start: Union[str, datetime] = None,
+        end: Union[str, datetime] = None,
+    ) -> pd.Series:
+        """
+        See `MultiOhlcvAnalyser.normalized_coef`.
+        """
+        return await self._query("normalized_coef", arg, start, end)
+
+    async def coef_score(
+        self,
+        arg: str,
+        start: Union[str, datetime] = None,
+        end: Union[str, datetime] = None,
+    ) -> pd.Series:
+        """
+        See `MultiOhlcvAnalyser.coef_score`.
+        """
+        return await self._query("coef_score", arg, start, end)
+
+    async def oc_variance(
+        self,
+        start: Union[str, datetime] = None,
+        end: Union[str, datetime] = None,
+    ) -> pd.Series:
+        """
+        See `MultiOhlcvAnalyser.oc_variance`.
+        """
+        return await self._query("oc_variance", start, end)
+
+    async def hl_variance(
+        self,
+        start: Union[str, datetime] = None,
+        end: Union[str, datetime] = None,
+    ) -> pd.Series:
+        """
+        See `MultiOhlcvAnalyser.hl_variance`.
+        """
+        return await self._query("hl_variance", start, end)
+
+    async def profit(
+        self,
+        arg: str = "close",
+        start: Union[str, datetime] = None,
+        end: Union[str, datetime] = None,
+    ) -> pd.Series:
+        """
+        See `MultiOhlcvAnalyser.profit`.
+        """
+        return await self._query("profit", arg, start, end)
+
+    async def max_profit(
+        self,
+        start: Union[str, datetime] = None,
+        end: Union[str, datetime] = None,
+    ) -> pd.Series:
+        """
+        See `MultiOhlcvAnalyser.max_profit`.
+        """
+        return await self._query("max_profit", start, end)
+
+    async def min_profit(
+        self,
+        start: Union[str, datetime] = None,
+        end: Union[str, datetime] = None,
+    ) -> pd.Series:
+        """
+        See `MultiOhlcvAnalyser.min_profit`.
+        """
+        return await self._query("min_profit", start, end)
+
+    async def max_drawdown(
+        self,
+        start: Union[str, datetime] = None,
+        end: Union[str, datetime] = None,
+    ) -> pd.Series:
+        """
+        See `MultiOhlcvAnalyser.max_drawdown`.
+        """
+        return await self._query("max_drawdown", start, end)
+
+    async def screen(
+        self,
+        key: str,
+        k: int = None,
+        filters: Dict[str, Tuple[float, float]] = None,
+        start: Union[str, datetime] = None,
+        end: Union[str, datetime] = None,
+        ascending: bool = False,
+    ) -> pd.DataFrame:
+        """
+        See `MultiOhlcvAnalyser.screen`.
+        """
+        return await self._query(
+            "screen", key, k, filters, start, end, ascending
+        )
+
+    async def summary(
+        self,
+        start: Union[str, datetime] = None,
+        end: Union[str, datetime] = None,
+        args: List[str] = None,
+    ) -> pd.DataFrame:
+        """
+        See `MultiOhlcvAnalyser.summary`.
+        """
+        return await self._query("summary", start, end, args)
@@ -1,40 +1,443 @@
-from typing import Union
+import threading
+import weakref
+from concurrent.futures import Executor
+from typing import ContextManager, Dict, List, Optional, Tuple, Union
 from datetime import datetime
+import numpy as np
 import pandas as pd
 
-from .analyser import CoefficientAnalyser, ProfitAnalyser, VarianceAnalyser
-from .utils import filter_date
+from .analyser import ProfitAnalyser
+from .backend import get_backend
+from .StreamingOhlcvAnalyser import StreamingOhlcvAnalyser
+from .store import OhlcvStore
+from .utils import CodeLayout, ResultCache, compact_ohlcv
+from .utils.cache import cached_result
+from .utils.metrics import (
+    COEF_METRICS,
+    METRIC_COSTS,
+    Metric,
+    get_metric_columns,
+    get_segment_metrics,
+    parse_metric_name,
+)
+from .utils.prefix import PrefixSumIndex
+from .utils.profiling import NULL_STAGE, Profiler, profiled
+from .utils.resample import ResamplePyramid
+
+ACCUMULATED_ARGS = ["open", "high", "low", "close", "volume"]
 
 
 class MultiOhlcvAnalyser:
-    def __init__(self, multi_ohlcv: pd.DataFrame) -> None:
+    def __init__(
+        self,
+        multi_ohlcv: pd.DataFrame,
+        compact: bool = False,
+        n_jobs: int = 1,
+        executor: Executor = None,
+        cache_size: int = 0,
+        cache_bytes: int = None,
+        prefix_index: bool = False,
+        backend: str = None,
+        profiler: Profiler = None,
+    ) -> None:
         """
         Initialize the MultiOhlcvAnalyser class.
 
+        The data is sorted once by (code, date) so that every code occupies
+        a contiguous block of rows that the methods slice instead of grouping.
+        Once bars have been appended, full-range results are served from
+        per-code accumulators that `append` updates in place. The lazily
+        built state is guarded by a lock, so concurrent threads can query
+        the same analyser, but `append` must not run alongside queries, see
+        `AsyncMultiOhlcvAnalyser`.
+
         Parameters:
         - multi_ohlcv (pd.DataFrame): The multi-ohlcv data.
+        - compact (bool): Whether to store the data with compact dtypes, see `compact_ohlcv`. Default is False.
+        - n_jobs (int): The number of code shards computed in parallel. Default is 1.
+        - executor (Executor): The executor running the shards. Default is None for a process pool of n_jobs workers.
+        - cache_size (int): The number of results kept in an LRU cache. Default is 0 for no cache.
+        - cache_bytes (int): The memory budget of the cache in bytes. Default is None for no budget.
+        - prefix_index (bool): Whether to answer date-range queries from per-code prefix sums, see `PrefixSumIndex`. Default is False.
+        - backend (str): The backend of the segment kernels, "numpy" or "numba". Default is None for the global default, see `set_backend`.
+        - profiler (Profiler): The profiler measuring the stages of every call, see `Profiler`. Default is None for no profiling.
+
+        Returns:
+        None
+        """
+        if compact:
+            multi_ohlcv = compact_ohlcv(multi_ohlcv)
+        self._compact = compact
+        self._layout = CodeLayout(multi_ohlcv)
+        self._pending_bars = []
+        self._accumulator = None
+        self.n_jobs = n_jobs
+        self._executor = executor
+        self._shared_columns = None
+        self._use_prefix_index = prefix_index
+        if backend is not None:
+            get_backend(backend)
+        self.backend = backend
+        self._prefix_index = None
+        self._pyramid = None
+        self._resampled = {}
+        self._lock = threading.RLock()
+        self.profiler = profiler
+        self._cache = (
+            ResultCache(cache_size, cache_bytes) if cache_size else None
+        )
+
+    @classmethod
+    def from_store(
+        cls,
+        path: str,
+        codes: List = None,
+        start: Union[str, datetime] = None,
+        end: Union[str, datetime] = None,
+        compact: bool = False,
+        **kwargs,
+    ) -> "MultiOhlcvAnalyser":
+        """
+        Create a MultiOhlcvAnalyser from an `OhlcvStore` on disk.
+
+        The codes and the date range are pushed down to the memory-mapped
+        store, so only the selected rows are ever read.
+
+        Parameters:
+        - path (str): The directory of the store.
+        - codes (List): The codes to load. Default is None for all codes.
+        - start (Union[str, datetime]): The start date. Default is None.
+        - end (Union[str, datetime]): The end date. Default is None.
+        - compact (bool): Whether to store the data with compact dtypes. Default is False.
+        - **kwargs: The other keyword arguments of the constructor, e.g. n_jobs, cache_size, prefix_index, backend or profiler.
+
+        Returns:
+        MultiOhlcvAnalyser: The analyser of the selected data.
+        """
+        multi_ohlcv = OhlcvStore(path).load(codes, start, end)
+        return cls(multi_ohlcv, compact=compact, **kwargs)
+
+    @property
+    def ohlcv(self) -> pd.DataFrame:
+        """
+        Get the multi-ohlcv data sorted by (code, date), including appended bars.
+
+        The data is read-only, as the code layout, the accumulators and the
+        indexes are derived from it: add bars with `append`, or create a new
+        analyser for other data.
+
+        Returns:
+        pd.DataFrame: The multi-ohlcv data.
+        """
+        return self._get_layout().ohlcv
+
+    def _stage(self, name: str) -> ContextManager:
+        """
+        Get the context measuring a stage of the current call.
+
+        Parameters:
+        - name (str): The stage name.
+
+        Returns:
+        ContextManager: The profiler stage, or a no-op without a profiler.
+        """
+        if self.profiler is None:
+            return NULL_STAGE
+        return self.profiler.stage(name)
+
+    def _get_layout(self) -> CodeLayout:
+        """
+        Get the code layout, folding in the bars appended since it was built.
+
+        Returns:
+        CodeLayout: The code layout of all bars.
+        """
+        if self._pending_bars:
+            with self._lock:
+                if self._pending_bars:
+                    self._rebuild_layout()
+        return self._layout
+
+    def _rebuild_layout(self) -> None:
+        """
+        Rebuild the code layout with the appended bars, dropping the state
+        derived from the old layout.
+
+        Returns:
+        None
+        """
+        with self._stage("layout"):
+            multi_ohlcv = pd.concat([self._layout.ohlcv, *self._pending_bars])
+            if self._compact:
+                multi_ohlcv = compact_ohlcv(multi_ohlcv)
+            self._layout = CodeLayout(multi_ohlcv)
+        self._prefix_index = None
+        if self._shared_columns is not None:
+            self._shared_columns.close()
+            self._shared_columns = None
+        # Cleared last, as the other threads skip the lock once it is empty
+        self._pending_bars = []
+
+    def _get_accumulator(
+        self,
+        start: Union[str, datetime] = None,
+        end: Union[str, datetime] = None,
+        args: List[str] = None,
+    ) -> Optional[StreamingOhlcvAnalyser]:
+        """
+        Get the full-range accumulators if they can answer a query.
+
+        The accumulators only exist once bars have been appended. Before
+        that, full-range queries take the segment path, which computes the
+        requested metrics only and respects `n_jobs`.
+
+        Parameters:
+        - start (Union[str, datetime]): The start date of the query. Default is None.
+        - end (Union[str, datetime]): The end date of the query. Default is None.
+        - args (List[str]): The columns the query reads. Default is None.
+
+        Returns:
+        Optional[StreamingOhlcvAnalyser]: The accumulators, or None if there are none yet, or the query needs a date range or a column they do not track.
+        """
+        accumulator = self._accumulator
+        if accumulator is None or start is not None or end is not None:
+            return None
+        if not set(args or []) <= set(accumulator.args):
+            return None
+        return accumulator
+
+    def _build_accumulator(self) -> None:
+        """
+        Build the full-range accumulators from all bars.
+
+        Returns:
+        None
+        """
+        layout = self._get_layout()
+        with self._stage("accumulator"):
+            self._accumulator = StreamingOhlcvAnalyser(
+                [arg for arg in ACCUMULATED_ARGS if arg in layout.ohlcv],
+                backend=self.backend,
+            ).update(layout.ohlcv)
+
+    @profiled
+    def append(self, new_bars: pd.DataFrame) -> None:
+        """
+        Append new bars to the multi-ohlcv data.
+
+        The full-range accumulators are built from the current bars on the
+        first append, then updated with the new bars only, so refreshed
+        full-range results cost O(new bars). Every bar must be
+        later than the last bar of its code. Cached results and resampled
+        analysers are dropped.
+
+        Parameters:
+        - new_bars (pd.DataFrame): The new multi-ohlcv bars.
 
         Returns:
         None
         """
-        self.ohlcv = multi_ohlcv.copy()
+        with self._lock:
+            if self._accumulator is None:
+                self._build_accumulator()
+            with self._stage("accumulator"):
+                self._accumulator.update(new_bars)
+            self._pending_bars.append(new_bars)
+            self._pyramid = None
+            self._resampled = {}
+            if self._cache is not None:
+                self._cache.clear()
+
+    @profiled
+    def at(self, rule: str) -> "MultiOhlcvAnalyser":
+        """
+        Get an analyser of the bars resampled at a coarser resolution.
+
+        The resampled bars come from a pyramid of resolutions built on first
+        use, see `ResamplePyramid`, and the analyser of each resolution is
+        kept, so `analyser.at("W").coef("close")` resamples only once.
+        The analyser has the same options as this one.
+
+        Parameters:
+        - rule (str): The resolution, "D", "W", "M", "Q" or another pandas period alias.
+
+        Returns:
+        MultiOhlcvAnalyser: The analyser of the resampled bars.
+        """
+        with self._lock:
+            if rule not in self._resampled:
+                if self._pyramid is None:
+                    self._pyramid = ResamplePyramid(self.ohlcv)
+                with self._stage("resample"):
+                    bars = self._pyramid.get(rule)
+                cache = self._cache
+                self._resampled[rule] = MultiOhlcvAnalyser(
+                    bars,
+                    compact=self._compact,
+                    n_jobs=self.n_jobs,
+                    executor=self._executor,
+                    cache_size=0 if cache is None else cache.maxsize,
+                    cache_bytes=None if cache is None else cache.max_bytes,
+                    prefix_index=self._use_prefix_index,
+                    backend=self.backend,
+                    profiler=self.profiler,
+                )
+            return self._resampled[rule]
+
+    def cache_info(self) -> Optional[Dict[str, int]]:
+        """
+        Get the statistics of the result cache.
+
+        Returns:
+        Optional[Dict[str, int]]: The hits, misses, number of results, maxsize and size in bytes, or None without a cache.
+        """
+        if self._cache is None:
+            return None
+        return self._cache.info()
+
+    def _get_bounds(
+        self,
+        start: Union[str, datetime] = None,
+        end: Union[str, datetime] = None,
+    ) -> Tuple[pd.Index, np.ndarray, np.ndarray]:
+        """
+        Get the row bounds of the codes that have data within a date range.
+
+        Parameters:
+        - start (Union[str, datetime]): The start date. Default is None.
+        - end (Union[str, datetime]): The end date. Default is None.
+
+        Returns:
+        Tuple[pd.Index, np.ndarray, np.ndarray]: The codes and their lo, hi row bounds.
+        """
+        layout = self._get_layout()
+        with self._stage("bounds"):
+            lo, hi = layout.get_bounds(start, end)
+            has_rows = lo < hi
+            return layout.codes[has_rows], lo[has_rows], hi[has_rows]
+
+    def _get_values(self, arg: str) -> np.ndarray:
+        """
+        Get the values of a column of the sorted ohlcv data.
+
+        Parameters:
+        - arg (str): The column name.
+
+        Returns:
+        np.ndarray: The column values.
+        """
+        return self.ohlcv[arg].to_numpy()
+
+    def _get_sharded_metrics(
+        self, lo: np.ndarray, hi: np.ndarray, metrics: List[Metric]
+    ) -> Dict[Metric, np.ndarray]:
+        """
+        Compute per-code metrics on the executor, sharded by code.
+
+        The needed columns are copied into shared memory once and reused by
+        later calls until the data changes.
+
+        Parameters:
+        - lo (np.ndarray): The first row of each code.
+        - hi (np.ndarray): One past the last row of each code.
+        - metrics (List[Metric]): The (metric, arg) pairs.
+
+        Returns:
+        Dict[Metric, np.ndarray]: The values of each metric per code.
+        """
+        # Imported on first use, as multiprocessing is slow to import
+        from concurrent.futures import ProcessPoolExecutor
+
+        from .utils.parallel import SharedColumns, get_sharded_metrics
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(self.n_jobs)
+                weakref.finalize(self, self._executor.shutdown)
+            if self._shared_columns is None:
+                self._shared_columns = SharedColumns()
+                weakref.finalize(self, self._shared_columns.close)
+            descriptors = {
+                column: self._shared_columns.get_descriptor(
+                    column, self._get_values(column)
+                )
+                for column in get_metric_columns(metrics)
+            }
+        return get_sharded_metrics(
+            self._executor,
+            descriptors,
+            lo,
+            hi,
+            metrics,
+            self.n_jobs,
+            self.backend,
+        )
+
+    def _get_prefix_index(self) -> PrefixSumIndex:
+        """
+        Get the prefix-sum index of the data, building it on first use.
+
+        Returns:
+        PrefixSumIndex: The prefix-sum index of the current code layout.
+        """
+        layout = self._get_layout()
+        with self._lock:
+            if self._prefix_index is None:
+                with self._stage("prefix_index"):
+                    self._prefix_index = PrefixSumIndex(layout)
+            return self._prefix_index
+
+    def _compute_metrics(
+        self, lo: np.ndarray, hi: np.ndarray, metrics: List[Metric]
+    ) -> Dict[Metric, np.ndarray]:
+        """
+        Compute metrics over the non-empty [lo, hi) row blocks of some codes.
+
+        Parameters:
+        - lo (np.ndarray): The first row of each code.
+        - hi (np.ndarray): One past the last row of each code.
+        - metrics (List[Metric]): The (metric, arg) pairs, see `get_segment_metrics`.
+
+        Returns:
+        Dict[Metric, np.ndarray]: The values of each metric per code.
+        """
+        if self._use_prefix_index:
+            prefix_index = self._get_prefix_index()
+            with self._stage("kernels"):
+                return prefix_index.get_metrics(lo, hi, metrics)
+        if self.n_jobs > 1 and len(lo) > 1:
+            with self._stage("kernels"):
+                return self._get_sharded_metrics(lo, hi, metrics)
+        values = {
+            column: self._get_values(column)
+            for column in get_metric_columns(metrics)
+        }
+        with self._stage("kernels"):
+            return get_segment_metrics(values, lo, hi, metrics, self.backend)
 
-    @staticmethod
-    def _get_groupby_code(ohlcv: pd.DataFrame, start: str, end: str):
+    def _get_metrics(
+        self,
+        metrics: List[Metric],
+        start: Union[str, datetime] = None,
+        end: Union[str, datetime] = None,
+    ) -> Tuple[pd.Index, np.ndarray, np.ndarray, Dict[Metric, np.ndarray]]:
         """
-        Get the groupby object of the ohlcv data based on the code column.
+        Compute per-code metrics over a date range in a single pass.
 
         Parameters:
-        - ohlcv (pd.DataFrame): The ohlcv data.
-        - start (str): The start date.
-        - end (str): The end date.
+        - metrics (List[Metric]): The (metric, arg) pairs, see `get_segment_metrics`.
+        - start (Union[str, datetime]): The start date. Default is None.
+        - end (Union[str, datetime]): The end date. Default is None.
 
         Returns:
-        pd.core.groupby.generic.DataFrameGroupBy: The groupby object.
+        Tuple[pd.Index, np.ndarray, np.ndarray, Dict[Metric, np.ndarray]]: The codes, their lo, hi row bounds and the values of each metric.
         """
-        groupby_ohlcv = filter_date(ohlcv, start, end).groupby("code")
-        return groupby_ohlcv
+        codes, lo, hi = self._get_bounds(start, end)
+        results = self._compute_metrics(lo, hi, metrics)
+        return codes, lo, hi, results
 
+    @profiled
+    @cached_result
     def info(
         self,
         start: Union[str, datetime] = None,
@@ -50,31 +453,21 @@ class MultiOhlcvAnalyser:
         Returns:
         pd.DataFrame: The information dataframe.
         """
-        ohlcv = filter_date(self.ohlcv, start, end)
-        groupby_code = self._get_groupby_code(ohlcv, start, end)
-        profit_row = groupby_code.apply(
-            lambda x: ProfitAnalyser.get_start_end_profit(x["close"])
-        )
-        info_dict = {
-            "total_stock_code": len(set(ohlcv["code"])),
-            "start_date": ohlcv.index.min(),
-            "end_date": ohlcv.index.max(),
-            "market_average_profit": (profit_row.mean().round(2)),
-            "increased_stock_pct": round(
-                len(profit_row[profit_row > 0]) / len(profit_row), 2
-            )
-            * 100,
-            "decreased_stock_pct": round(
-                len(profit_row[profit_row <= 0]) / len(profit_row), 2
-            )
-            * 100,
-        }
-
-        info_df = pd.DataFrame.from_dict(
-            info_dict, orient="index", columns=["value"]
+        accumulator = self._get_accumulator(start, end, ["close"])
+        if accumulator is not None:
+            return accumulator.info()
+        codes, lo, hi, results = self._get_metrics(
+            [("profit", "close")], start, end
+        )
+        profit_row = pd.Series(results[("profit", "close")], index=codes)
+        dates = self.ohlcv.index
+        info_df = ProfitAnalyser.get_market_info_df(
+            profit_row, dates[lo].min(), dates[hi - 1].max()
         )
         return info_df
 
+    @profiled
+    @cached_result
     def coef(
         self,
         arg: str,
@@ -92,12 +485,17 @@ class MultiOhlcvAnalyser:
         Returns:
         pd.Series: The coefficient series.
         """
-        groupby_code = self._get_groupby_code(self.ohlcv, start, end)
-        coef_series = groupby_code.apply(
-            lambda x: CoefficientAnalyser.get_coefficient(x[arg])
-        ).rename(f"{arg}_coef")
+        accumulator = self._get_accumulator(start, end, [arg])
+        if accumulator is not None:
+            return accumulator.coef(arg)
+        codes, _, _, results = self._get_metrics([("coef", arg)], start, end)
+        coef_series = pd.Series(
+            results[("coef", arg)], index=codes, name=f"{arg}_coef"
+        )
         return coef_series
 
+    @profiled
+    @cached_result
     def normalized_coef(
         self,
         arg: str,
@@ -115,12 +513,21 @@ class MultiOhlcvAnalyser:
         Returns:
         pd.Series: The normalized coefficient series.
         """
-        groupby_code = self._get_groupby_code(self.ohlcv, start, end)
-        normalized_coef_series = groupby_code.apply(
-            lambda x: CoefficientAnalyser.get_normalized_coefficient(x[arg])
-        ).rename(f"{arg}_normalized_coef")
+        accumulator = self._get_accumulator(start, end, [arg])
+        if accumulator is not None:
+            return accumulator.normalized_coef(arg)
+        codes, _, _, results = self._get_metrics(
+            [("normalized_coef", arg)], start, end
+        )
+        normalized_coef_series = pd.Series(
+            results[("normalized_coef", arg)],
+            index=codes,
+            name=f"{arg}_normalized_coef",
+        )
         return normalized_coef_series
 
+    @profiled
+    @cached_result
     def coef_score(
         self,
         arg: str,
@@ -138,12 +545,19 @@ class MultiOhlcvAnalyser:
         Returns:
         pd.Series: The coefficient score series.
         """
-        groupby_code = self._get_groupby_code(self.ohlcv, start, end)
-        coef_score_series = groupby_code.apply(
-            lambda x: CoefficientAnalyser.get_coefficient_score(x[arg])
-        ).rename(f"{arg}_coef_score")
+        accumulator = self._get_accumulator(start, end, [arg])
+        if accumulator is not None:
+            return accumulator.coef_score(arg)
+        codes, _, _, results = self._get_metrics(
+            [("coef_score", arg)], start, end
+        )
+        coef_score_series = pd.Series(
+            results[("coef_score", arg)], index=codes, name=f"{arg}_coef_score"
+        )
         return coef_score_series
 
+    @profiled
+    @cached_result
     def oc_variance(
         self,
         start: Union[str, datetime] = None,
@@ -159,14 +573,19 @@ class MultiOhlcvAnalyser:
         Returns:
         pd.Series: The (open - close) variance series.
         """
-        groupby_code = self._get_groupby_code(self.ohlcv, start, end)
-        oc_variance_series = groupby_code.apply(
-            lambda x: VarianceAnalyser.get_normalized_diff_variance(
-                x["open"], x["close"]
-            )
-        ).rename("oc_variance")
+        accumulator = self._get_accumulator(start, end, ["open", "close"])
+        if accumulator is not None:
+            return accumulator.oc_variance()
+        codes, _, _, results = self._get_metrics(
+            [("oc_variance", None)], start, end
+        )
+        oc_variance_series = pd.Series(
+            results[("oc_variance", None)], index=codes, name="oc_variance"
+        )
         return oc_variance_series
 
+    @profiled
+    @cached_result
     def hl_variance(
         self,
         start: Union[str, datetime] = None,
@@ -182,14 +601,19 @@ class MultiOhlcvAnalyser:
         Returns:
         pd.Series: The (high - low) variance series.
         """
-        groupby_code = self._get_groupby_code(self.ohlcv, start, end)
-        hl_variance_series = groupby_code.apply(
-            lambda x: VarianceAnalyser.get_normalized_diff_variance(
-                x["high"], x["low"]
-            )
-        ).rename("hl_variance")
+        accumulator = self._get_accumulator(start, end, ["high", "low"])
+        if accumulator is not None:
+            return accumulator.hl_variance()
+        codes, _, _, results = self._get_metrics(
+            [("hl_variance", None)], start, end
+        )
+        hl_variance_series = pd.Series(
+            results[("hl_variance", None)], index=codes, name="hl_variance"
+        )
         return hl_variance_series
 
+    @profiled
+    @cached_result
     def profit(
         self,
         arg: str = "close",
@@ -207,9 +631,254 @@ class MultiOhlcvAnalyser:
         Returns:
         pd.Series: The profit series.
         """
-        ohlcv = self.ohlcv.copy()
-        groupby_code = self._get_groupby_code(ohlcv, start, end)
-        profit_series = groupby_code.apply(
-            lambda x: ProfitAnalyser.get_start_end_profit(x[arg])
-        ).rename("profit")
+        accumulator = self._get_accumulator(start, end, [arg])
+        if accumulator is not None:
+            return accumulator.profit(arg)
+        codes, _, _, results = self._get_metrics([("profit", arg)], start, end)
+        profit_series = pd.Series(
+            results[("profit", arg)], index=codes, name="profit"
+        )
         return profit_series
+
+    @profiled
+    @cached_result
+    def max_profit(
+        self,
+        start: Union[str, datetime] = None,
+        end: Union[str, datetime] = None,
+    ) -> pd.Series:
+        """
+        Get the profit series between the first close and the highest close.
+
+        Parameters:
+        - start (Union[str, datetime]): The start date. Default is None.
+        - end (Union[str, datetime]): The end date. Default is None.
+
+        Returns:
+        pd.Series: The maximum profit series.
+        """
+        accumulator = self._get_accumulator(start, end, ["close"])
+        if accumulator is not None:
+            return accumulator.max_profit()
+        codes, _, _, results = self._get_metrics(
+            [("max_profit", "close")], start, end
+        )
+        max_profit_series = pd.Series(
+            results[("max_profit", "close")], index=codes, name="max_profit"
+        )
+        return max_profit_series
+
+    @profiled
+    @cached_result
+    def min_profit(
+        self,
+        start: Union[str, datetime] = None,
+        end: Union[str, datetime] = None,
+    ) -> pd.Series:
+        """
+        Get the profit series between the first close and the lowest close.
+
+        Parameters:
+        - start (Union[str, datetime]): The start date. Default is None.
+        - end (Union[str, datetime]): The end date. Default is None.
+
+        Returns:
+        pd.Series: The minimum profit series.
+        """
+        accumulator = self._get_accumulator(start, end, ["close"])
+        if accumulator is not None:
+            return accumulator.min_profit()
+        codes, _, _, results = self._get_metrics(
+            [("min_profit", "close")], start, end
+        )
+        min_profit_series = pd.Series(
+            results[("min_profit", "close")], index=codes, name="min_profit"
+        )
+        return min_profit_series
+
+    @profiled
+    @cached_result
+    def max_drawdown(
+        self,
+        start: Union[str, datetime] = None,
+        end: Union[str, datetime] = None,
+    ) -> pd.Series:
+        """
+        Get the maximum drawdown series, the largest fall from a running peak
+        close to a later close.
+
+        Parameters:
+        - start (Union[str, datetime]): The start date. Default is None.
+        - end (Union[str, datetime]): The end date. Default is None.
+
+        Returns:
+        pd.Series: The maximum drawdown series.
+        """
+        accumulator = self._get_accumulator(start, end, ["close"])
+        if accumulator is not None:
+            return accumulator.max_drawdown()
+        codes, _, _, results = self._get_metrics(
+            [("max_drawdown", "close")], start, end
+        )
+        max_drawdown_series = pd.Series(
+            results[("max_drawdown", "close")],
+            index=codes,
+            name="max_drawdown",
+        )
+        return max_drawdown_series
+
+    @profiled
+    @cached_result
+    def screen(
+        self,
+        key: str,
+        k: int = None,
+        filters: Dict[str, Tuple[float, float]] = None,
+        start: Union[str, datetime] = None,
+        end: Union[str, datetime] = None,
+        ascending: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Rank the codes by a metric among the codes passing some filters.
+
+        The filters run from the cheapest metric to the most expensive one,
+        each on the codes that passed the previous filters only, and the top
+        k codes are selected with a partial sort. Codes with a NaN key or a
+        NaN filtered metric are dropped.
+
+        Parameters:
+        - key (str): The metric to rank by, named like the result series, e.g. "close_normalized_coef", "profit" or "max_drawdown".
+        - k (int): The number of codes to return. Default is None for every code passing the filters.
+        - filters (Dict[str, Tuple[float, float]]): The inclusive (min, max) bounds of metrics, None for no bound, e.g. {"close_coef_score": (0.6, None), "profit": (10, None)}. Default is None.
+        - start (Union[str, datetime]): The start date. Default is None.
+        - end (Union[str, datetime]): The end date. Default is None.
+        - ascending (bool): Whether to rank the lowest values first. Default is False.
+
+        Returns:
+        pd.DataFrame: The key and filtered metrics of the selected codes, ranked by the key.
+        """
+        filters = filters or {}
+        codes, lo, hi = self._get_bounds(start, end)
+        positions = np.arange(len(codes))
+        columns = {}
+        for name in sorted(
+            filters, key=lambda name: METRIC_COSTS[parse_metric_name(name)[0]]
+        ):
+            metric = parse_metric_name(name)
+            values = self._compute_metrics(
+                lo[positions], hi[positions], [metric]
+            )[metric]
+            low, high = filters[name]
+            passed = ~np.isnan(values)
+            if low is not None:
+                passed &= values >= low
+            if high is not None:
+                passed &= values <= high
+            positions = positions[passed]
+            columns = {
+                column: column_values[passed]
+                for column, column_values in columns.items()
+            }
+            columns[name] = values[passed]
+
+        if key not in columns:
+            metric = parse_metric_name(key)
+            columns[key] = self._compute_metrics(
+                lo[positions], hi[positions], [metric]
+            )[metric]
+        has_key = ~np.isnan(columns[key])
+        positions = positions[has_key]
+        columns = {
+            column: column_values[has_key]
+            for column, column_values in columns.items()
+        }
+        order = columns[key] if ascending else -columns[key]
+        if k is not None and k < len(order):
+            order_positions = np.argpartition(order, k - 1)[:k]
+            order_positions = order_positions[
+                np.argsort(order[order_positions], kind="stable")
+            ]
+        else:
+            order_positions = np.argsort(order, kind="stable")
+        screen_df = pd.DataFrame(
+            {
+                column: columns[column][order_positions]
+                for column in [key, *filters]
+                if column in columns
+            },
+            index=codes[positions[order_positions]],
+        )
+        return screen_df
+
+    @profiled
+    @cached_result
+    def summary(
+        self,
+        start: Union[str, datetime] = None,
+        end: Union[str, datetime] = None,
+        args: List[str] = None,
+    ) -> pd.DataFrame:
+        """
+        Get every per-code metric in a single pass over the date range.
+
+        The date range is resolved and every needed column is gathered once,
+        instead of once per method call. The market information that `info`
+        returns for the same range is attached as `summary_df.attrs["info"]`.
+
+        Parameters:
+        - start (Union[str, datetime]): The start date. Default is None.
+        - end (Union[str, datetime]): The end date. Default is None.
+        - args (List[str]): The arguments to calculate the coefficients of. Default is ["close"].
+
+        Returns:
+        pd.DataFrame: The coefficient, coefficient score, profit and variance columns indexed by code.
+        """
+        if args is None:
+            args = ["close"]
+        accumulator = self._get_accumulator(
+            start, end, [*args, "open", "high", "low", "close"]
+        )
+        if accumulator is not None:
+            summary_df = pd.concat(
+                [
+                    *[
+                        pd.concat(
+                            [
+                                accumulator.coef(arg),
+                                accumulator.normalized_coef(arg),
+                                accumulator.coef_score(arg),
+                            ],
+                            axis=1,
+                        )
+                        for arg in args
+                    ],
+                    accumulator.profit("close"),
+                    accumulator.oc_variance(),
+                    accumulator.hl_variance(),
+                ],
+                axis=1,
+            )
+            summary_df.attrs["info"] = accumulator.info()
+            return summary_df
+        metrics = [
+            *[(metric, arg) for arg in args for metric in COEF_METRICS],
+            ("profit", "close"),
+            ("oc_variance", None),
+            ("hl_variance", None),
+        ]
+        codes, lo, hi, results = self._get_metrics(metrics, start, end)
+        summary_df = pd.DataFrame(
+            {
+                (f"{arg}_{metric}" if metric in COEF_METRICS else metric): (
+                    values
+                )
+                for (metric, arg), values in results.items()
+            },
+            index=codes,
+        )
+        profit_row = summary_df["profit"]
+        dates = self.ohlcv.index
+        summary_df.attrs["info"] = ProfitAnalyser.get_market_info_df(
+            profit_row, dates[lo].min(), dates[hi - 1].max()
+        )
+        return summary_df
@@ -1,23 +1,189 @@
+from typing import Dict, Optional, Union
+import numpy as np
 import pandas as pd
 
 from .analyser import ProfitAnalyser, PriceAnalyser, CoefficientAnalyser
-from .utils import filter_date
+from .StreamingOhlcvAnalyser import StreamingOhlcvAnalyser
+from .utils import (
+    ResultCache,
+    SparseTable,
+    compact_ohlcv,
+    filter_date,
+    get_date_bounds,
+)
+from .utils.cache import cached_result
+from .utils.resample import ResamplePyramid
 
 class SingleOhlcvAnalyser:
-    def __init__(self, single_ohlcv: pd.DataFrame):
+    def __init__(
+        self,
+        single_ohlcv: pd.DataFrame,
+        compact: bool = False,
+        cache_size: int = 0,
+        cache_bytes: int = None,
+    ):
         """
         Initialize the SingleOhlcvAnalyser class.
 
+        The data is kept sorted by date so that date ranges are sliced with a
+        binary search instead of being copied out with boolean masks.
+
         Parameters:
         - single_ohlcv (pd.DataFrame): The OHLCV data for a single stock.
+        - compact (bool): Whether to store the data with compact dtypes, see `compact_ohlcv`. Default is False.
+        - cache_size (int): The number of results kept in an LRU cache. Default is 0 for no cache.
+        - cache_bytes (int): The memory budget of the cache in bytes. Default is None for no budget.
+
+        """
+        self._compact = compact
+        self._cache = (
+            ResultCache(cache_size, cache_bytes) if cache_size else None
+        )
+        self.ohlcv = single_ohlcv
+
+    @property
+    def ohlcv(self) -> pd.DataFrame:
+        """
+        Get the OHLCV data sorted by date, including appended bars.
+
+        Returns:
+        - pd.DataFrame: The OHLCV data.
+
+        """
+        if self._pending_bars:
+            self._fold_pending_bars()
+        return self._ohlcv
+
+    @ohlcv.setter
+    def ohlcv(self, single_ohlcv: pd.DataFrame) -> None:
+        """
+        Replace the OHLCV data, dropping every result derived from the old
+        data: the accumulators, the sparse table, the resampled analysers
+        and the cached results.
+
+        Parameters:
+        - single_ohlcv (pd.DataFrame): The OHLCV data for a single stock.
+
+        """
+        if self._compact:
+            single_ohlcv = compact_ohlcv(single_ohlcv)
+        self._ohlcv = single_ohlcv.sort_index(kind="stable")
+        self._pending_bars = []
+        self._accumulator = None
+        self._sparse_table = None
+        self._pyramid = None
+        self._resampled = {}
+        if self._cache is not None:
+            self._cache.clear()
+
+    def _fold_pending_bars(self) -> None:
+        """
+        Concatenate the bars appended since the data was last read.
+
+        The appended bars are later than the data, so only they are sorted.
+
+        """
+        new_bars = pd.concat(self._pending_bars).sort_index(kind="stable")
+        single_ohlcv = pd.concat([self._ohlcv, new_bars])
+        if self._compact:
+            single_ohlcv = compact_ohlcv(single_ohlcv)
+        self._ohlcv = single_ohlcv
+        self._pending_bars = []
+
+    def _get_sparse_table(self) -> SparseTable:
+        """
+        Get the range min/max/drawdown index of the close, building it on
+        first use.
+
+        Returns:
+        - SparseTable: The sparse table of the close.
+
+        """
+        if self._sparse_table is None:
+            self._sparse_table = SparseTable(
+                self.ohlcv["close"].to_numpy(dtype=float)
+            )
+        return self._sparse_table
+
+    def append(self, new_bars: pd.DataFrame) -> None:
+        """
+        Append new bars to the OHLCV data.
+
+        The full-range accumulators behind `info()` are built from the
+        current bars on the first append, then updated with the new bars
+        only, and the bars are concatenated to the data when it is next
+        read, so appending and refreshing `info()` cost O(new bars). Every
+        bar must be later than the last bar of the data. Cached results,
+        the sparse table and resampled analysers are dropped.
+
+        Parameters:
+        - new_bars (pd.DataFrame): The new OHLCV bars of the same stock.
+
+        """
+        if self._compact:
+            new_bars = compact_ohlcv(new_bars)
+        accumulator = self._accumulator
+        if accumulator is None:
+            accumulator = StreamingOhlcvAnalyser().update(self.ohlcv)
+        accumulator.update(new_bars)
+        self._accumulator = accumulator
+        self._pending_bars.append(new_bars)
+        self._sparse_table = None
+        self._pyramid = None
+        self._resampled = {}
+        if self._cache is not None:
+            self._cache.clear()
+
+    def at(self, rule: str) -> "SingleOhlcvAnalyser":
+        """
+        Get an analyser of the bars resampled at a coarser resolution.
+
+        The resampled bars come from a pyramid of resolutions built on first
+        use, see `ResamplePyramid`, and the analyser of each resolution is
+        kept, so `analyser.at("W").info()` resamples only once. The analyser
+        has the same options as this one.
+
+        Parameters:
+        - rule (str): The resolution, "D", "W", "M", "Q" or another pandas period alias.
+
+        Returns:
+        - SingleOhlcvAnalyser: The analyser of the resampled bars.
+
+        """
+        if rule not in self._resampled:
+            if self._pyramid is None:
+                self._pyramid = ResamplePyramid(self.ohlcv)
+            cache = self._cache
+            self._resampled[rule] = SingleOhlcvAnalyser(
+                self._pyramid.get(rule),
+                compact=self._compact,
+                cache_size=0 if cache is None else cache.maxsize,
+                cache_bytes=None if cache is None else cache.max_bytes,
+            )
+        return self._resampled[rule]
 
+    def cache_info(self) -> Optional[Dict[str, int]]:
         """
-        self.ohlcv = single_ohlcv.copy()
+        Get the statistics of the result cache.
 
+        Returns:
+        - Optional[Dict[str, int]]: The hits, misses, number of results, maxsize and size in bytes, or None without a cache.
+
+        """
+        if self._cache is None:
+            return None
+        return self._cache.info()
+
+    @cached_result
     def info(self, start=None, end=None) -> pd.DataFrame:
         """
         Get information about the OHLCV data.
 
+        The max/min profits and the max drawdown of a date range are read
+        from a sparse table of the close in O(1) instead of scanning it. The
+        full range is scanned once, or read from the accumulators once bars
+        have been appended.
+
         Parameters:
         - start (str or None): The start date for filtering the data. Default is None.
         - end (str or None): The end date for filtering the data. Default is None.
@@ -26,28 +192,80 @@ class SingleOhlcvAnalyser:
         - pd.DataFrame: A DataFrame containing the information about the OHLCV data.
 
         """
-        ohlcv = filter_date(self.ohlcv, start, end)
+        if start is None and end is None and self._accumulator is not None:
+            accumulator = self._accumulator
+            state = accumulator.state.iloc[0]
+            info_dict = {
+                "stock_code": accumulator.state.index[0],
+                "start_date": state["first_date"],
+                "end_date": state["last_date"],
+                "start_end_profit": accumulator.profit().iloc[0],
+                "start_max_profit": accumulator.max_profit().iloc[0],
+                "start_min_profit": accumulator.min_profit().iloc[0],
+                "max_drawdown": accumulator.max_drawdown().iloc[0],
+            }
+            return pd.DataFrame.from_dict(
+                info_dict, orient="index", columns=["value"]
+            )
+
+        lo, hi = get_date_bounds(self.ohlcv.index, start, end)
+        if lo == hi:
+            raise ValueError("There is no data within the date range")
+        close = self.ohlcv["close"]
         info_dict = {
-            "stock_code": ohlcv["code"].iloc[0],
-            "start_date": ohlcv.index.min(),
-            "end_date": ohlcv.index.max(),
+            "stock_code": self.ohlcv["code"].iloc[lo],
+            "start_date": self.ohlcv.index[lo],
+            "end_date": self.ohlcv.index[hi - 1],
             "start_end_profit": ProfitAnalyser.get_start_end_profit(
-                ohlcv["close"]
-            ),
-            "start_max_profit": ProfitAnalyser.get_start_max_profit(
-                ohlcv["close"]
-            ),
-            "start_min_profit": ProfitAnalyser.get_start_min_profit(
-                ohlcv["close"]
+                close.iloc[lo:hi]
             ),
         }
+        if hi - lo == len(self.ohlcv):
+            # A single scan is cheaper than building the table for one query
+            info_dict.update(
+                {
+                    "start_max_profit": ProfitAnalyser.get_start_max_profit(
+                        close
+                    ),
+                    "start_min_profit": ProfitAnalyser.get_start_min_profit(
+                        close
+                    ),
+                    "max_drawdown": ProfitAnalyser.get_max_drawdown(close),
+                }
+            )
+        else:
+            buying_price = float(close.iloc[lo])
+            table = self._get_sparse_table()
+            bounds = np.array([lo]), np.array([hi])
+            info_dict.update(
+                {
+                    "start_max_profit": ProfitAnalyser.calc_pct(
+                        (table.get_max(*bounds)[0] - buying_price)
+                        / buying_price
+                    ),
+                    "start_min_profit": ProfitAnalyser.calc_pct(
+                        (table.get_min(*bounds)[0] - buying_price)
+                        / buying_price
+                    ),
+                    "max_drawdown": ProfitAnalyser.calc_pct(
+                        table.get_min_ratio(*bounds)[0] - 1
+                    ),
+                }
+            )
         info_df = pd.DataFrame.from_dict(
             info_dict, orient="index", columns=["value"]
         )
         return info_df
 
 
-    def get_price_rank_series(self, start: str, end: str, price: float) -> pd.Series:
+    def get_price_rank_series(
+        self,
+        start: str,
+        end: str,
+        price: float,
+        seed: int = None,
+        method: str = "sampling",
+    ) -> pd.Series:
         """
         Get the price rank series for a given date range and price.
 
@@ -55,31 +273,134 @@ class SingleOhlcvAnalyser:
         - start (str): The start date for filtering the data.
         - end (str): The end date for filtering the data.
         - price (float): The price for calculating the price rank.
+        - seed (int): The seed for sampling the statistical prices. Default is None.
+        - method (str): "sampling" to rank against sampled statistical prices, or "analytic" to rank against their distribution directly. Default is "sampling".
 
         Returns:
         - pd.Series: A Series containing the price rank information.
 
         """
         filtered_ohlcv = filter_date(self.ohlcv, start, end)
-        statistical_prices = PriceAnalyser.get_statistical_prices(
-            filtered_ohlcv["high"],
-            filtered_ohlcv["low"],
-            filtered_ohlcv["volume"],
-        )
+        if method == "sampling":
+            statistical_prices = PriceAnalyser.get_statistical_prices(
+                filtered_ohlcv["high"],
+                filtered_ohlcv["low"],
+                filtered_ohlcv["volume"],
+                seed=seed,
+            )
+            mean_price = statistical_prices.mean()
+            price_rank = PriceAnalyser.get_price_rank(statistical_prices, price)
+        elif method == "analytic":
+            mean_price = PriceAnalyser.get_analytic_mean_price(
+                filtered_ohlcv["high"],
+                filtered_ohlcv["low"],
+                filtered_ohlcv["volume"],
+            )
+            price_rank = PriceAnalyser.get_analytic_price_rank(
+                filtered_ohlcv["high"],
+                filtered_ohlcv["low"],
+                filtered_ohlcv["volume"],
+                price,
+            )
+        else:
+            raise ValueError(f"Unknown price rank method: {method}")
         price_rank_series = pd.Series(
             {
                 "start_date": start.strftime("%Y-%m-%d"),
                 "date_diff": (end - start).days,
                 "end_date": end.strftime("%Y-%m-%d"),
                 "price": price,
-                "mean_price": round(statistical_prices.mean(), 2),
-                "price_rank": PriceAnalyser.get_price_rank(
-                    statistical_prices, price
-                ),
+                "mean_price": round(mean_price, 2),
+                "price_rank": price_rank,
             }
         )
         return price_rank_series
 
+    def get_price_rank_df(
+        self,
+        queries: pd.DataFrame,
+        seed: int = None,
+        method: str = "sampling",
+    ) -> pd.DataFrame:
+        """
+        Get the price rank information for many (start, end, price) queries.
+
+        The data is filtered and the statistical prices are sampled and sorted
+        once per distinct date range; every price of that range is then ranked
+        with a binary search, or, with the analytic method, against the
+        mixture built once for the range.
+
+        Parameters:
+        - queries (pd.DataFrame): The queries with "start", "end" and "price" columns.
+        - seed (int): The seed for sampling the statistical prices of each date range. Default is None.
+        - method (str): "sampling" or "analytic", as in `get_price_rank_series`. Default is "sampling".
+
+        Returns:
+        - pd.DataFrame: A DataFrame with the price rank information of each query, indexed like the queries.
+
+        """
+        if method not in ("sampling", "analytic"):
+            raise ValueError(f"Unknown price rank method: {method}")
+        if len(queries) == 0:
+            return pd.DataFrame(
+                {
+                    "start_date": pd.Series(dtype=str),
+                    "date_diff": pd.Series(dtype=int),
+                    "end_date": pd.Series(dtype=str),
+                    "price": pd.Series(dtype=float),
+                    "mean_price": pd.Series(dtype=float),
+                    "price_rank": pd.Series(dtype=float),
+                },
+                index=queries.index,
+            )
+        price_rank_dfs = []
+        for (start, end), window_queries in queries.groupby(
+            ["start", "end"], sort=False
+        ):
+            filtered_ohlcv = filter_date(self.ohlcv, start, end)
+            prices = window_queries["price"].to_numpy(dtype=float)
+            if method == "sampling":
+                statistical_prices = np.sort(
+                    PriceAnalyser.get_statistical_prices(
+                        filtered_ohlcv["high"],
+                        filtered_ohlcv["low"],
+                        filtered_ohlcv["volume"],
+                        seed=seed,
+                    )
+                )
+                mean_price = statistical_prices.mean()
+                price_ranks = PriceAnalyser.get_price_ranks(
+                    statistical_prices, prices
+                )
+            else:
+                mean_price = PriceAnalyser.get_analytic_mean_price(
+                    filtered_ohlcv["high"],
+                    filtered_ohlcv["low"],
+                    filtered_ohlcv["volume"],
+                )
+                price_ranks = PriceAnalyser.get_analytic_price_ranks(
+                    filtered_ohlcv["high"],
+                    filtered_ohlcv["low"],
+                    filtered_ohlcv["volume"],
+                    prices,
+                )
+            price_rank_dfs.append(
+                pd.DataFrame(
+                    {
+                        "start_date": start.strftime("%Y-%m-%d"),
+                        "date_diff": (end - start).days,
+                        "end_date": end.strftime("%Y-%m-%d"),
+                        "price": window_queries["price"],
+                        "mean_price": round(mean_price, 2),
+                        "price_rank": price_ranks,
+                    },
+                    index=window_queries.index,
+                )
+            )
+        price_rank_df = pd.concat(price_rank_dfs).reindex(queries.index)
+        return price_rank_df
+
+    @cached_result
     def get_coefficient_series(self, arg: str, start: str, end: str) -> pd.Series:
         """
         Get the coefficient series for a given argument, start date, and end date.
@@ -105,4 +426,58 @@ class SingleOhlcvAnalyser:
                 ),
             }
         )
-        return coefficient_series
\ No newline at end of file
+        return coefficient_series
+
+    @cached_result
+    def rolling_coefficient(
+        self, arg: str, window: Union[int, str], normalized: bool = True
+    ) -> pd.DataFrame:
+        """
+        Get the coefficient and coefficient score of every sliding window.
+
+        The regression sums are maintained with rolling sums, so each step adds
+        the entering row and removes the leaving one instead of refitting the
+        whole window, and the full history is covered in linear time.
+
+        Parameters:
+        - arg (str): The argument for calculating the coefficient.
+        - window (Union[int, str]): The number of rows, or a time offset such as "30D", of each window.
+        - normalized (bool): Whether to normalize the coefficient by the window mean. Default is True.
+
+        Returns:
+        - pd.DataFrame: A DataFrame containing the coefficient and coefficient score of the window ending at each date.
+
+        """
+        y = self.ohlcv[arg].astype(float)
+        x = pd.Series(np.arange(1, len(y) + 1, dtype=float), index=y.index)
+        min_periods = window if isinstance(window, int) else 1
+        terms_df = pd.DataFrame(
+            {
+                "n": 1.0,
+                "sum_x": x,
+                "sum_y": y,
+                "sum_xy": x * y,
+                "sum_xx": x * x,
+                "sum_yy": y * y,
+            }
+        )
+        sums = (
+            terms_df.rolling(window, min_periods=min_periods)
+            .sum()
+            .T.to_numpy()
+        )
+        get_coefficient_from_sums = (
+            CoefficientAnalyser.get_normalized_coefficient_from_sums
+            if normalized
+            else CoefficientAnalyser.get_coefficient_from_sums
+        )
+        rolling_coefficient_df = pd.DataFrame(
+            {
+                "coefficient": get_coefficient_from_sums(*sums[:5]),
+                "coefficient_score": (
+                    CoefficientAnalyser.get_coefficient_score_from_sums(*sums)
+                ),
+            },
+            index=y.index,
+        )
+        return rolling_coefficient_df
@@ -0,0 +1,463 @@
+from typing import Iterable, List, Union
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+from .analyser import CoefficientAnalyser, ProfitAnalyser
+from .backend import get_backend
+from .utils import CodeLayout, filter_date
+
+VARIANCE_ARGS = {"oc": ("open", "close"), "hl": ("high", "low")}
+
+
+class StreamingOhlcvAnalyser:
+    def __init__(
+        self,
+        args: List[str] = None,
+        start: Union[str, datetime] = None,
+        end: Union[str, datetime] = None,
+        backend: str = None,
+    ) -> None:
+        """
+        Initialize the StreamingOhlcvAnalyser class.
+
+        Instead of holding the multi-ohlcv data, the analyser folds chunks of
+        it into running per-code state: first/last values, min/max close,
+        the close drawdown, regression sums and (count, mean, m2) of the
+        normalized OC/HL differences. Memory is bounded by the number of
+        codes. The rows of a code must arrive in chronological order across
+        chunks.
+
+        Parameters:
+        - args (List[str]): The arguments to calculate the coefficients of. Default is ["close"].
+        - start (Union[str, datetime]): The start date of the rows to fold. Default is None.
+        - end (Union[str, datetime]): The end date of the rows to fold. Default is None.
+        - backend (str): The backend of the segment kernels. Default is None for the global default, see `set_backend`.
+
+        Returns:
+        None
+        """
+        self.args = ["close"] if args is None else list(args)
+        self.start = start
+        self.end = end
+        self.backend = backend
+        self.state = None
+
+    @classmethod
+    def from_chunks(
+        cls,
+        chunks: Iterable[pd.DataFrame],
+        args: List[str] = None,
+        start: Union[str, datetime] = None,
+        end: Union[str, datetime] = None,
+        backend: str = None,
+    ) -> "StreamingOhlcvAnalyser":
+        """
+        Create a StreamingOhlcvAnalyser by folding an iterator of chunks,
+        such as the chunks of `pd.read_csv(..., chunksize=...)`.
+
+        Parameters:
+        - chunks (Iterable[pd.DataFrame]): The multi-ohlcv chunks indexed by date.
+        - args (List[str]): The arguments to calculate the coefficients of. Default is ["close"].
+        - start (Union[str, datetime]): The start date of the rows to fold. Default is None.
+        - end (Union[str, datetime]): The end date of the rows to fold. Default is None.
+        - backend (str): The backend of the segment kernels. Default is None for the global default.
+
+        Returns:
+        StreamingOhlcvAnalyser: The analyser of all chunks.
+        """
+        analyser = cls(args, start, end, backend)
+        for chunk in chunks:
+            analyser.update(chunk)
+        return analyser
+
+    def merge(
+        self, other: "StreamingOhlcvAnalyser"
+    ) -> "StreamingOhlcvAnalyser":
+        """
+        Merge the state of another analyser into a new analyser.
+
+        The two analysers may cover different codes, such as shards folded
+        separately, or the same codes with `other` folded from later rows.
+
+        Parameters:
+        - other (StreamingOhlcvAnalyser): The analyser to merge, with the same args and date range.
+
+        Returns:
+        StreamingOhlcvAnalyser: The merged analyser.
+        """
+        if (self.args, self.start, self.end) != (
+            other.args,
+            other.start,
+            other.end,
+        ):
+            raise ValueError(
+                "Only analysers with the same args and date range can merge"
+            )
+        merged = StreamingOhlcvAnalyser(
+            self.args, self.start, self.end, self.backend
+        )
+        if self.state is None or other.state is None:
+            merged.state = other.state if self.state is None else self.state
+        else:
+            merged.state = self._merge_states(self.state, other.state)
+        return merged
+
+    @property
+    def _value_args(self) -> List[str]:
+        """
+        Get the columns whose first and last values are kept.
+
+        Returns:
+        List[str]: The column names.
+        """
+        return list(dict.fromkeys(["close", *self.args]))
+
+    def update(self, chunk: pd.DataFrame) -> "StreamingOhlcvAnalyser":
+        """
+        Fold a chunk of multi-ohlcv data into the per-code state.
+
+        Parameters:
+        - chunk (pd.DataFrame): The multi-ohlcv chunk indexed by date.
+
+        Returns:
+        StreamingOhlcvAnalyser: The analyser itself.
+        """
+        chunk = filter_date(chunk, self.start, self.end)
+        if len(chunk) == 0:
+            return self
+        chunk_state = self._get_chunk_state(chunk)
+        self.state = (
+            chunk_state
+            if self.state is None
+            else self._merge_states(self.state, chunk_state)
+        )
+        return self
+
+    def _get_chunk_state(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """
+        Get the per-code state of a single chunk.
+
+        Parameters:
+        - chunk (pd.DataFrame): The multi-ohlcv chunk indexed by date.
+
+        Returns:
+        pd.DataFrame: The state indexed by code.
+        """
+        layout = CodeLayout(chunk)
+        ohlcv = layout.ohlcv
+        lo, hi = layout.offsets[:-1], layout.offsets[1:]
+        kernels = get_backend(self.backend)(lo, hi)
+
+        state = {
+            "first_date": ohlcv.index[lo],
+            "last_date": ohlcv.index[hi - 1],
+            "n": (hi - lo).astype(float),
+        }
+        for column in self._value_args:
+            values = ohlcv[column].to_numpy(dtype=float)
+            state[f"first_{column}"] = values[lo]
+            state[f"last_{column}"] = values[hi - 1]
+        close = ohlcv["close"].to_numpy(dtype=float)
+        state["min_close"] = kernels.range_min(close)
+        state["max_close"] = kernels.range_max(close)
+        state["drawdown_close"] = kernels.min_ratio(close)
+        for arg in self.args:
+            _, _, sum_y, sum_xy, _, sum_yy = kernels.regression_sums(
+                ohlcv[arg].to_numpy()
+            )
+            state[f"{arg}_sum_y"] = sum_y
+            state[f"{arg}_sum_xy"] = sum_xy
+            state[f"{arg}_sum_yy"] = sum_yy
+        for name, (a_arg, b_arg) in VARIANCE_ARGS.items():
+            if a_arg not in ohlcv or b_arg not in ohlcv:
+                # Data without the columns of a variance, e.g. close only,
+                # folds empty moments, so the variance is NaN
+                count = mean = m2 = np.zeros(len(lo))
+            else:
+                count, mean, m2 = kernels.normalized_diff_moments(
+                    ohlcv[a_arg].to_numpy(), ohlcv[b_arg].to_numpy()
+                )
+            state[f"{name}_count"] = count
+            # The mean of no values is 0 so that it merges as an empty
+            # state, while an infinite mean, e.g. from a zero open, is kept
+            state[f"{name}_mean"] = np.where(count == 0, 0.0, mean)
+            state[f"{name}_m2"] = m2
+        return pd.DataFrame(state, index=layout.codes)
+
+    @staticmethod
+    def _merge_states(left: pd.DataFrame, right: pd.DataFrame) -> pd.DataFrame:
+        """
+        Merge two per-code states, the rows of `right` following the rows of
+        `left` in time for every code they share.
+
+        Parameters:
+        - left (pd.DataFrame): The earlier state.
+        - right (pd.DataFrame): The later state.
+
+        Returns:
+        pd.DataFrame: The merged state.
+        """
+        codes = left.index.union(right.index)
+        in_left = codes.isin(left.index)
+        in_right = codes.isin(right.index)
+        left = left.reindex(codes)
+        right = right.reindex(codes)
+        both = in_left & in_right
+        if (right["first_date"][both] <= left["last_date"][both]).any():
+            raise ValueError(
+                "The rows of a code must be folded in chronological order"
+            )
+
+        merged = pd.DataFrame(index=codes)
+        for column in left.columns:
+            if column.startswith("first_"):
+                merged[column] = left[column].where(in_left, right[column])
+            elif column.startswith("last_"):
+                merged[column] = right[column].where(in_right, left[column])
+        merged["min_close"] = np.fmin(left["min_close"], right["min_close"])
+        merged["max_close"] = np.fmax(left["max_close"], right["max_close"])
+        # A drawdown lies within a state or falls from the peak of `left`
+        # to the trough of `right`
+        merged["drawdown_close"] = np.fmin(
+            np.fmin(left["drawdown_close"], right["drawdown_close"]),
+            right["min_close"] / left["max_close"],
+        )
+
+        # Only the codes missing from a side merge as empty sums, so that
+        # the NaN and inf of the codes of both sides propagate as they do
+        # when the rows are folded in a single chunk
+        columns = left.columns
+        left = left.select_dtypes("number").where(
+            pd.Series(in_left, index=codes), 0, axis=0
+        )
+        right = right.select_dtypes("number").where(
+            pd.Series(in_right, index=codes), 0, axis=0
+        )
+        merged["n"] = left["n"] + right["n"]
+        for column in left.columns:
+            if column.endswith(("_sum_y", "_sum_yy")):
+                merged[column] = left[column] + right[column]
+            elif column.endswith("_sum_xy"):
+                # The positions of `right` continue after the n rows of `left`
+                sum_y = right[column.replace("_sum_xy", "_sum_y")]
+                merged[column] = (
+                    left[column] + right[column] + left["n"] * sum_y
+                )
+        for name in VARIANCE_ARGS:
+            left_count = left[f"{name}_count"]
+            right_count = right[f"{name}_count"]
+            count = left_count + right_count
+            delta = right[f"{name}_mean"] - left[f"{name}_mean"]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                weight = (right_count / count).where(count > 0, 0)
+            merged[f"{name}_count"] = count
+            merged[f"{name}_mean"] = left[f"{name}_mean"] + delta * weight
+            merged[f"{name}_m2"] = (
+                left[f"{name}_m2"]
+                + right[f"{name}_m2"]
+                + delta**2 * left_count * weight
+            )
+        return merged[columns]
+
+    def _get_state(self) -> pd.DataFrame:
+        """
+        Get the per-code state, failing if nothing has been folded yet.
+
+        Returns:
+        pd.DataFrame: The state indexed by code.
+        """
+        if self.state is None:
+            raise ValueError("No rows have been folded into the analyser")
+        return self.state
+
+    def _get_regression_sums(self, arg: str) -> np.ndarray:
+        """
+        Get the regression sums of an argument from the state.
+
+        Parameters:
+        - arg (str): The argument to get the sums of.
+
+        Returns:
+        np.ndarray: The n, sum_x, sum_y, sum_xy, sum_xx and sum_yy rows.
+        """
+        if arg not in self.args:
+            raise KeyError(f"{arg} is not one of the streamed args")
+        state = self._get_state()
+        n = state["n"].to_numpy()
+        return np.array(
+            [
+                n,
+                n * (n + 1) / 2,
+                state[f"{arg}_sum_y"].to_numpy(),
+                state[f"{arg}_sum_xy"].to_numpy(),
+                n * (n + 1) * (2 * n + 1) / 6,
+                state[f"{arg}_sum_yy"].to_numpy(),
+            ]
+        )
+
+    def info(self) -> pd.DataFrame:
+        """
+        Get general information about the folded multi-ohlcv data.
+
+        Returns:
+        pd.DataFrame: The information dataframe.
+        """
+        state = self._get_state()
+        info_df = ProfitAnalyser.get_market_info_df(
+            self.profit("close"),
+            state["first_date"].min(),
+            state["last_date"].max(),
+        )
+        return info_df
+
+    def coef(self, arg: str) -> pd.Series:
+        """
+        Get the coefficient series for a given argument.
+
+        Parameters:
+        - arg (str): The argument to calculate the coefficient.
+
+        Returns:
+        pd.Series: The coefficient series.
+        """
+        coef_series = pd.Series(
+            CoefficientAnalyser.get_coefficient_from_sums(
+                *self._get_regression_sums(arg)[:5]
+            ),
+            index=self._get_state().index,
+            name=f"{arg}_coef",
+        )
+        return coef_series
+
+    def normalized_coef(self, arg: str) -> pd.Series:
+        """
+        Get the normalized coefficient series for a given argument.
+
+        Parameters:
+        - arg (str): The argument to calculate the normalized coefficient.
+
+        Returns:
+        pd.Series: The normalized coefficient series.
+        """
+        normalized_coef_series = pd.Series(
+            CoefficientAnalyser.get_normalized_coefficient_from_sums(
+                *self._get_regression_sums(arg)[:5]
+            ),
+            index=self._get_state().index,
+            name=f"{arg}_normalized_coef",
+        )
+        return normalized_coef_series
+
+    def coef_score(self, arg: str) -> pd.Series:
+        """
+        Get the coefficient score series for a given argument.
+
+        Parameters:
+        - arg (str): The argument to calculate the coefficient score.
+
+        Returns:
+        pd.Series: The coefficient score series.
+        """
+        coef_score_series = pd.Series(
+            CoefficientAnalyser.get_coefficient_score_from_sums(
+                *self._get_regression_sums(arg)
+            ),
+            index=self._get_state().index,
+            name=f"{arg}_coef_score",
+        )
+        return coef_score_series
+
+    def _get_variance(self, name: str) -> pd.Series:
+        """
+        Get the variance of a normalized difference from its moments.
+
+        Parameters:
+        - name (str): "oc" or "hl".
+
+        Returns:
+        pd.Series: The variance series.
+        """
+        state = self._get_state()
+        count = state[f"{name}_count"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            variance = (state[f"{name}_m2"] / (count - 1)).where(count > 1)
+        return variance.rename(f"{name}_variance")
+
+    def oc_variance(self) -> pd.Series:
+        """
+        Get the (open - close) variance series.
+
+        Returns:
+        pd.Series: The (open - close) variance series.
+        """
+        return self._get_variance("oc")
+
+    def hl_variance(self) -> pd.Series:
+        """
+        Get the (high - low) variance series.
+
+        Returns:
+        pd.Series: The (high - low) variance series.
+        """
+        return self._get_variance("hl")
+
+    def max_profit(self) -> pd.Series:
+        """
+        Get the profit series between the first close and the highest close.
+
+        Returns:
+        pd.Series: The maximum profit series.
+        """
+        state = self._get_state()
+        max_profit_series = ProfitAnalyser.calc_pct(
+            (state["max_close"] - state["first_close"]) / state["first_close"]
+        ).rename("max_profit")
+        return max_profit_series
+
+    def min_profit(self) -> pd.Series:
+        """
+        Get the profit series between the first close and the lowest close.
+
+        Returns:
+        pd.Series: The minimum profit series.
+        """
+        state = self._get_state()
+        min_profit_series = ProfitAnalyser.calc_pct(
+            (state["min_close"] - state["first_close"]) / state["first_close"]
+        ).rename("min_profit")
+        return min_profit_series
+
+    def max_drawdown(self) -> pd.Series:
+        """
+        Get the maximum drawdown series of the close, the largest fall from a
+        running peak to a later close.
+
+        Returns:
+        pd.Series: The maximum drawdown series.
+        """
+        state = self._get_state()
+        max_drawdown_series = ProfitAnalyser.calc_pct(
+            state["drawdown_close"] - 1
+        ).rename("max_drawdown")
+        return max_drawdown_series
+
+    def profit(self, arg: str = "close") -> pd.Series:
+        """
+        Get the profit series for a given argument.
+
+        Parameters:
+        - arg (str): The argument to calculate the profit. Default is "close".
+
+        Returns:
+        pd.Series: The profit series.
+        """
+        if arg not in self._value_args:
+            raise KeyError(f"{arg} is not one of the streamed args")
+        state = self._get_state()
+        buying_price = state[f"first_{arg}"]
+        selling_price = state[f"last_{arg}"]
+        profit_series = ProfitAnalyser.calc_pct(
+            (selling_price - buying_price) / buying_price
+        ).rename("profit")
+        return profit_series
@@ -1,2 +1,28 @@
+import importlib
+
 from .MultiOhlcvAnalyser import MultiOhlcvAnalyser
 from .SingleOhlcvAnalyser import SingleOhlcvAnalyser
+from .StreamingOhlcvAnalyser import StreamingOhlcvAnalyser
+
+# Subpackages imported on first attribute access, e.g. `OhlcvAnalyser.plotter`
+LAZY_SUBPACKAGES = ["analyser", "backend", "plotter", "store", "utils"]
+
+# Classes imported on first attribute access, as their modules pull in
+# dependencies that most callers do not need, e.g. asyncio
+LAZY_CLASSES = {"AsyncMultiOhlcvAnalyser": "AsyncMultiOhlcvAnalyser"}
+
+
+def __getattr__(name: str):
+    if name in LAZY_SUBPACKAGES:
+        return importlib.import_module(f".{name}", __name__)
+    if name in LAZY_CLASSES:
+        module = importlib.import_module(f".{LAZY_CLASSES[name]}", __name__)
+        # Importing the submodule binds it to the same name in this package,
+        # so the class is bound over it
+        globals()[name] = getattr(module, name)
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted({*globals(), *LAZY_SUBPACKAGES, *LAZY_CLASSES})
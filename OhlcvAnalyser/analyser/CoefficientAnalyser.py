@@ -1,26 +1,48 @@
+from typing import Tuple
 import numpy as np
 import pandas as pd
-from sklearn.linear_model import LinearRegression
-
-lr = LinearRegression()
 
 
 class CoefficientAnalyser:
+    @staticmethod
+    def _get_centered_regression(
+        series: pd.Series,
+    ) -> Tuple[np.ndarray, np.ndarray, float]:
+        """
+        Centers the positions 1..n and the values of a series for a closed-form
+        least squares fit.
+
+        Args:
+            series (pd.Series): The input series.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, float]: The centered x, the centered y and the coefficient.
+        """
+        x = np.arange(1, len(series) + 1, dtype=float)
+        y = np.asarray(series, dtype=float)
+        x_centered = x - x.mean()
+        y_centered = y - y.mean()
+        s_xx = x_centered @ x_centered
+        coefficient = (x_centered @ y_centered) / s_xx if s_xx > 0 else 0.0
+        return x_centered, y_centered, coefficient
+
     @staticmethod
     def get_coefficient(series: pd.Series) -> float:
         """
         Calculates the coefficient of a series using linear regression.
 
+        The least squares slope against the positions 1..n is computed in
+        closed form, as `LinearRegression` would fit it.
+
         Args:
             series (pd.Series): The input series.
 
         Returns:
             float: The coefficient value.
         """
-        x = np.arange(1, len(series) + 1).reshape(-1, 1)
-        y = series.values.reshape(-1, 1)
-        lr.fit(x, y)
-        coefficient = lr.coef_[0][0]
+        _, _, coefficient = CoefficientAnalyser._get_centered_regression(
+            series
+        )
         return coefficient
 
     @staticmethod
@@ -28,16 +50,26 @@ class CoefficientAnalyser:
         """
         Calculates the coefficient score of a series using linear regression.
 
+        The R^2 score is that of `LinearRegression.score`, except that a
+        constant series, e.g. a halted stock, scores NaN, as does a single
+        observation: no fit explains a variance that is zero.
+
         Args:
             series (pd.Series): The input series.
 
         Returns:
             float: The coefficient score value.
         """
-        x = np.arange(1, len(series) + 1).reshape(-1, 1)
-        y = series.values.reshape(-1, 1)
-        lr.fit(x, y)
-        score = lr.score(x, y)
+        y = np.asarray(series, dtype=float)
+        if len(y) < 2 or y.min() == y.max():
+            return np.nan
+        x_centered, y_centered, coefficient = (
+            CoefficientAnalyser._get_centered_regression(series)
+        )
+        residuals = y_centered - coefficient * x_centered
+        ss_res = residuals @ residuals
+        ss_tot = y_centered @ y_centered
+        score = 1 - ss_res / ss_tot
         return score
 
     @staticmethod
@@ -55,4 +87,104 @@ class CoefficientAnalyser:
         normalized_coefficient = CoefficientAnalyser.get_coefficient(
             normalized_series
         )
-        return normalized_coefficient
\ No newline at end of file
+        return normalized_coefficient
+
+    @staticmethod
+    def get_coefficient_from_sums(
+        n: np.ndarray,
+        sum_x: np.ndarray,
+        sum_y: np.ndarray,
+        sum_xy: np.ndarray,
+        sum_xx: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Calculates the least squares coefficient from regression sums.
+
+        Args:
+            n (np.ndarray): The number of observations.
+            sum_x (np.ndarray): The sum of x.
+            sum_y (np.ndarray): The sum of y.
+            sum_xy (np.ndarray): The sum of x * y.
+            sum_xx (np.ndarray): The sum of x * x.
+
+        Returns:
+            np.ndarray: The coefficient values.
+        """
+        n = np.asarray(n, dtype=float)
+        s_xx = np.asarray(sum_xx) - np.asarray(sum_x) ** 2 / n
+        s_xy = np.asarray(sum_xy) - np.asarray(sum_x) * np.asarray(sum_y) / n
+        with np.errstate(divide="ignore", invalid="ignore"):
+            coefficient = np.where(s_xx > 0, s_xy / s_xx, 0.0)
+        return coefficient
+
+    @staticmethod
+    def get_normalized_coefficient_from_sums(
+        n: np.ndarray,
+        sum_x: np.ndarray,
+        sum_y: np.ndarray,
+        sum_xy: np.ndarray,
+        sum_xx: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Calculates the normalized coefficient from regression sums.
+
+        Dividing y by its mean divides the coefficient by the same mean, so no
+        second set of sums is needed.
+
+        Args:
+            n (np.ndarray): The number of observations.
+            sum_x (np.ndarray): The sum of x.
+            sum_y (np.ndarray): The sum of y.
+            sum_xy (np.ndarray): The sum of x * y.
+            sum_xx (np.ndarray): The sum of x * x.
+
+        Returns:
+            np.ndarray: The normalized coefficient values.
+        """
+        coefficient = CoefficientAnalyser.get_coefficient_from_sums(
+            n, sum_x, sum_y, sum_xy, sum_xx
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            normalized_coefficient = coefficient / (np.asarray(sum_y) / n)
+        return normalized_coefficient
+
+    @staticmethod
+    def get_coefficient_score_from_sums(
+        n: np.ndarray,
+        sum_x: np.ndarray,
+        sum_y: np.ndarray,
+        sum_xy: np.ndarray,
+        sum_xx: np.ndarray,
+        sum_yy: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Calculates the R^2 score of the least squares fit from regression sums.
+
+        Matches `get_coefficient_score`: a constant series and a single
+        observation score NaN.
+
+        Args:
+            n (np.ndarray): The number of observations.
+            sum_x (np.ndarray): The sum of x.
+            sum_y (np.ndarray): The sum of y.
+            sum_xy (np.ndarray): The sum of x * y.
+            sum_xx (np.ndarray): The sum of x * x.
+            sum_yy (np.ndarray): The sum of y * y.
+
+        Returns:
+            np.ndarray: The coefficient score values.
+        """
+        n = np.asarray(n, dtype=float)
+        sum_y = np.asarray(sum_y)
+        s_xx = np.asarray(sum_xx) - np.asarray(sum_x) ** 2 / n
+        s_xy = np.asarray(sum_xy) - np.asarray(sum_x) * sum_y / n
+        s_yy = np.asarray(sum_yy) - sum_y**2 / n
+        # Cancellation can leave a constant series with a tiny non-zero s_yy
+        is_constant = s_yy <= np.finfo(float).eps * n * np.abs(sum_yy)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            score = np.where(
+                is_constant | (n < 2),
+                np.nan,
+                np.minimum(s_xy**2 / (s_xx * s_yy), 1.0),
+            )
+        return score
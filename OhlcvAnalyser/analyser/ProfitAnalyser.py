@@ -14,7 +14,7 @@ class ProfitAnalyser:
         Returns:
             float: The percentage value of the given number.
         """
-        return round(value * 100, 3)
+        return np.round(value * 100, 3)
 
     @staticmethod
     def get_start_end_profit(price_series: pd.Series) -> float:
@@ -64,6 +64,55 @@ class ProfitAnalyser:
         min_profit = (min_price - buying_price) / buying_price
         return ProfitAnalyser.calc_pct(min_profit)
 
+    @staticmethod
+    def get_max_drawdown(price_series: pd.Series) -> float:
+        """
+        Calculate the maximum drawdown percentage, the largest fall from a running peak price to a later price in a price series.
+        
+        Args:
+            price_series (pd.Series): The price series.
+        
+        Returns:
+            float: The maximum drawdown percentage, zero or negative.
+        """
+        drawdown_ratio = (price_series / price_series.cummax()).min()
+        return ProfitAnalyser.calc_pct(drawdown_ratio - 1)
+
+    @staticmethod
+    def get_market_info_df(
+        profit_series: pd.Series, start_date, end_date
+    ) -> pd.DataFrame:
+        """
+        Summarize the start-end profits of many stocks into market information.
+
+        Args:
+            profit_series (pd.Series): The start-end profit of every stock.
+            start_date: The first date with data.
+            end_date: The last date with data.
+
+        Returns:
+            pd.DataFrame: The market information dataframe.
+        """
+        info_dict = {
+            "total_stock_code": len(profit_series),
+            "start_date": start_date,
+            "end_date": end_date,
+            "market_average_profit": (profit_series.mean().round(2)),
+            "increased_stock_pct": round(
+                len(profit_series[profit_series > 0]) / len(profit_series), 2
+            )
+            * 100,
+            "decreased_stock_pct": round(
+                len(profit_series[profit_series <= 0]) / len(profit_series), 2
+            )
+            * 100,
+        }
+
+        info_df = pd.DataFrame.from_dict(
+            info_dict, orient="index", columns=["value"]
+        )
+        return info_df
+
     @staticmethod
     def get_statistical_price_series(high_series: pd.Series, low_series: pd.Series) -> pd.Series:
         """
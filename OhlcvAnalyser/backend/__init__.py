@@ -0,0 +1,6 @@
+from .backend import (
+    get_available_backends,
+    get_backend,
+    get_backend_name,
+    set_backend,
+)
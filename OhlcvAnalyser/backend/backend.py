@@ -0,0 +1,84 @@
+import importlib
+from typing import List
+
+# Backend name -> (module, class), imported on first use so that optional
+# dependencies are only needed by the backends that are selected
+BACKENDS = {
+    "numpy": ("numpy_backend", "NumpyBackend"),
+    "numba": ("numba_backend", "NumbaBackend"),
+}
+
+_default_backend = "numpy"
+
+
+def get_backend(name: str = None) -> type:
+    """
+    Get the segment kernels of a backend.
+
+    Args:
+        name (str, optional): The backend name. Defaults to None for the global default, see `set_backend`.
+
+    Returns:
+        type: The backend class.
+
+    Raises:
+        ValueError: If the backend is unknown.
+        ImportError: If the dependencies of the backend are not installed.
+    """
+    name = get_backend_name(name)
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend: {name}")
+    module_name, class_name = BACKENDS[name]
+    try:
+        module = importlib.import_module(f".{module_name}", __package__)
+    except ImportError as error:
+        raise ImportError(
+            f'The "{name}" backend is not available: {error}'
+        ) from error
+    return getattr(module, class_name)
+
+
+def get_backend_name(name: str = None) -> str:
+    """
+    Resolve a backend name, None meaning the global default.
+
+    Args:
+        name (str, optional): The backend name. Defaults to None.
+
+    Returns:
+        str: The backend name.
+    """
+    return _default_backend if name is None else name
+
+
+def set_backend(name: str) -> None:
+    """
+    Set the global default backend of the analysers.
+
+    Args:
+        name (str): The backend name, "numpy" or "numba".
+
+    Raises:
+        ValueError: If the backend is unknown.
+        ImportError: If the dependencies of the backend are not installed.
+    """
+    global _default_backend
+    get_backend(name)
+    _default_backend = name
+
+
+def get_available_backends() -> List[str]:
+    """
+    Get the backends whose dependencies are installed.
+
+    Returns:
+        List[str]: The backend names.
+    """
+    available_backends = []
+    for name in BACKENDS:
+        try:
+            get_backend(name)
+        except ImportError:
+            continue
+        available_backends.append(name)
+    return available_backends
@@ -0,0 +1,164 @@
+from typing import Tuple
+import numba
+import numpy as np
+
+
+@numba.njit(cache=True, nogil=True, error_model="numpy")
+def _regression_sums(values, lo, hi):
+    sums = np.zeros((6, len(lo)))
+    for segment in range(len(lo)):
+        for row in range(lo[segment], hi[segment]):
+            x = float(row - lo[segment] + 1)
+            y = float(values[row])
+            sums[0, segment] += 1.0
+            sums[1, segment] += x
+            sums[2, segment] += y
+            sums[3, segment] += x * y
+            sums[4, segment] += x * x
+            sums[5, segment] += y * y
+    return sums
+
+
+@numba.njit(cache=True, nogil=True, error_model="numpy")
+def _normalized_diff_moments(a_values, b_values, lo, hi):
+    count = np.zeros(len(lo))
+    mean = np.full(len(lo), np.nan)
+    m2 = np.zeros(len(lo))
+    for segment in range(len(lo)):
+        total = 0.0
+        for row in range(lo[segment], hi[segment]):
+            a = float(a_values[row])
+            value = (a - float(b_values[row])) / a
+            if not np.isnan(value):
+                count[segment] += 1.0
+                total += value
+        if count[segment] == 0:
+            continue
+        mean[segment] = total / count[segment]
+        for row in range(lo[segment], hi[segment]):
+            a = float(a_values[row])
+            value = (a - float(b_values[row])) / a
+            if not np.isnan(value):
+                m2[segment] += (value - mean[segment]) ** 2
+    return count, mean, m2
+
+
+@numba.njit(cache=True, nogil=True, error_model="numpy")
+def _range_extrema(values, lo, hi):
+    minimum = np.full(len(lo), np.nan)
+    maximum = np.full(len(lo), np.nan)
+    for segment in range(len(lo)):
+        for row in range(lo[segment], hi[segment]):
+            value = float(values[row])
+            if np.isnan(value):
+                continue
+            if np.isnan(minimum[segment]) or value < minimum[segment]:
+                minimum[segment] = value
+            if np.isnan(maximum[segment]) or value > maximum[segment]:
+                maximum[segment] = value
+    return minimum, maximum
+
+
+@numba.njit(cache=True, nogil=True, error_model="numpy")
+def _min_ratio(values, lo, hi):
+    ratio = np.full(len(lo), np.nan)
+    for segment in range(len(lo)):
+        peak = np.nan
+        for row in range(lo[segment], hi[segment]):
+            value = float(values[row])
+            if np.isnan(value):
+                continue
+            if np.isnan(peak) or value > peak:
+                peak = value
+            if np.isnan(ratio[segment]) or value / peak < ratio[segment]:
+                ratio[segment] = value / peak
+    return ratio
+
+
+class NumbaBackend:
+    """
+    Segment kernels compiled with Numba: every [lo, hi) segment is reduced
+    in place with a single loop, without gathering its rows first.
+
+    The kernels are compiled on first use and cached on disk. They use
+    NumPy's error model, so a division by a zero price gives inf or NaN, as
+    in the numpy backend, instead of raising ZeroDivisionError.
+    """
+
+    name = "numba"
+
+    def __init__(self, lo: np.ndarray, hi: np.ndarray) -> None:
+        """
+        Bind the kernels to a set of segments.
+
+        Args:
+            lo (np.ndarray): The first row of each segment.
+            hi (np.ndarray): One past the last row of each segment.
+        """
+        self.lo = np.ascontiguousarray(lo, dtype=np.int64)
+        self.hi = np.ascontiguousarray(hi, dtype=np.int64)
+
+    def regression_sums(self, values: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """
+        Get the regression sums of every segment, regressing on positions 1..n.
+
+        Args:
+            values (np.ndarray): The column values.
+
+        Returns:
+            Tuple[np.ndarray, ...]: The n, sum_x, sum_y, sum_xy, sum_xx and sum_yy of each segment.
+        """
+        return tuple(_regression_sums(values, self.lo, self.hi))
+
+    def normalized_diff_moments(
+        self, a_values: np.ndarray, b_values: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the count, mean and m2 of the normalized difference of two
+        columns within every segment, skipping NaN.
+
+        Args:
+            a_values (np.ndarray): The first column values.
+            b_values (np.ndarray): The second column values.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: The count, mean and m2 of each segment.
+        """
+        return _normalized_diff_moments(a_values, b_values, self.lo, self.hi)
+
+    def range_min(self, values: np.ndarray) -> np.ndarray:
+        """
+        Get the minimum of every non-empty segment, skipping NaN.
+
+        Args:
+            values (np.ndarray): The column values.
+
+        Returns:
+            np.ndarray: The minimum of each segment.
+        """
+        return _range_extrema(values, self.lo, self.hi)[0]
+
+    def range_max(self, values: np.ndarray) -> np.ndarray:
+        """
+        Get the maximum of every non-empty segment, skipping NaN.
+
+        Args:
+            values (np.ndarray): The column values.
+
+        Returns:
+            np.ndarray: The maximum of each segment.
+        """
+        return _range_extrema(values, self.lo, self.hi)[1]
+
+    def min_ratio(self, values: np.ndarray) -> np.ndarray:
+        """
+        Get the drawdown ratio, min(values[j] / values[i]) over i <= j, of
+        every non-empty segment, skipping NaN.
+
+        Args:
+            values (np.ndarray): The column values.
+
+        Returns:
+            np.ndarray: The drawdown ratio of each segment.
+        """
+        return _min_ratio(values, self.lo, self.hi)
@@ -0,0 +1,122 @@
+from typing import Tuple
+import numpy as np
+import pandas as pd
+
+from ..analyser import VarianceAnalyser
+from ..utils.segment import (
+    get_segment_moments,
+    get_segment_regression_sums,
+    get_segment_rows,
+)
+
+
+class NumpyBackend:
+    """
+    Segment kernels written with vectorized NumPy: the rows of every
+    [lo, hi) segment are gathered back to back, once for all the kernels
+    of a query, and reduced with `bincount` and `reduceat`.
+    """
+
+    name = "numpy"
+
+    def __init__(self, lo: np.ndarray, hi: np.ndarray) -> None:
+        """
+        Bind the kernels to a set of segments.
+
+        Args:
+            lo (np.ndarray): The first row of each segment.
+            hi (np.ndarray): One past the last row of each segment.
+        """
+        self.lo = lo
+        self.hi = hi
+        self.counts = hi - lo
+        self.starts = np.cumsum(self.counts) - self.counts
+        self._segment_rows = None
+
+    def _get_segment_rows(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the gathered row numbers and segment ids, computing them on
+        first use.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The row numbers and the segment id of each row.
+        """
+        if self._segment_rows is None:
+            self._segment_rows = get_segment_rows(self.lo, self.hi)
+        return self._segment_rows
+
+    def regression_sums(self, values: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """
+        Get the regression sums of every segment, regressing on positions 1..n.
+
+        Args:
+            values (np.ndarray): The column values.
+
+        Returns:
+            Tuple[np.ndarray, ...]: The n, sum_x, sum_y, sum_xy, sum_xx and sum_yy of each segment.
+        """
+        rows, ids = self._get_segment_rows()
+        sums_df = get_segment_regression_sums(values[rows], ids, self.counts)
+        return tuple(sums_df.T.to_numpy())
+
+    def normalized_diff_moments(
+        self, a_values: np.ndarray, b_values: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the count, mean and m2 of the normalized difference of two
+        columns within every segment, skipping NaN.
+
+        Args:
+            a_values (np.ndarray): The first column values.
+            b_values (np.ndarray): The second column values.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: The count, mean and m2 of each segment.
+        """
+        rows, ids = self._get_segment_rows()
+        normalized_diff = VarianceAnalyser.get_normalized_diff_series(
+            a_values[rows].astype(float), b_values[rows].astype(float)
+        )
+        return get_segment_moments(normalized_diff, ids, self.counts)
+
+    def range_min(self, values: np.ndarray) -> np.ndarray:
+        """
+        Get the minimum of every non-empty segment, skipping NaN.
+
+        Args:
+            values (np.ndarray): The column values.
+
+        Returns:
+            np.ndarray: The minimum of each segment.
+        """
+        rows, _ = self._get_segment_rows()
+        return np.fmin.reduceat(values[rows].astype(float), self.starts)
+
+    def range_max(self, values: np.ndarray) -> np.ndarray:
+        """
+        Get the maximum of every non-empty segment, skipping NaN.
+
+        Args:
+            values (np.ndarray): The column values.
+
+        Returns:
+            np.ndarray: The maximum of each segment.
+        """
+        rows, _ = self._get_segment_rows()
+        return np.fmax.reduceat(values[rows].astype(float), self.starts)
+
+    def min_ratio(self, values: np.ndarray) -> np.ndarray:
+        """
+        Get the drawdown ratio, min(values[j] / values[i]) over i <= j, of
+        every non-empty segment, skipping NaN.
+
+        Args:
+            values (np.ndarray): The column values.
+
+        Returns:
+            np.ndarray: The drawdown ratio of each segment.
+        """
+        rows, ids = self._get_segment_rows()
+        segment_values = values[rows].astype(float)
+        peaks = pd.Series(segment_values).groupby(ids).cummax().to_numpy()
+        return np.fmin.reduceat(segment_values / peaks, self.starts)
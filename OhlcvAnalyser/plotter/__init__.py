@@ -1 +1,2 @@
+from .batch import render_charts
 from .plotter import Plotter
\ No newline at end of file
@@ -0,0 +1,279 @@
+import os
+from concurrent.futures import Executor
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple, Union
+import numpy as np
+import pandas as pd
+
+from ..utils import CodeLayout
+from .plotter import Plotter
+
+if TYPE_CHECKING:
+    from ..MultiOhlcvAnalyser import MultiOhlcvAnalyser
+
+PLOT_KINDS = ["general", "regression"]
+
+
+class _ChartRenderer:
+    """
+    One Agg figure whose artists are created for the first code and then
+    updated in place with the data of each following code.
+    """
+
+    def __init__(self, kind: str, options: Dict[str, Any]) -> None:
+        import matplotlib.dates as mdates
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        self.kind = kind
+        self.options = options
+        self.figure = Figure(figsize=options["figsize"], dpi=options["dpi"])
+        FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot()
+        self.ax.xaxis.set_major_locator(mdates.AutoDateLocator())
+        self.ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m-%d"))
+        self.artists = None
+
+    def render(self, code: Any, ohlcv: pd.DataFrame, path: str) -> None:
+        """
+        Draw the chart of a code and save it.
+
+        Args:
+            code (Any): The stock code, used as the title.
+            ohlcv (pd.DataFrame): The OHLCV data of the code.
+            path (str): The file path.
+        """
+        if self.kind == "general":
+            self._update_general(ohlcv)
+        else:
+            self._update_regression(ohlcv)
+        self.ax.set_title(str(code))
+        self.figure.savefig(path, format=self.options["file_format"])
+
+    def _update_general(self, ohlcv: pd.DataFrame) -> None:
+        """
+        Draw or update the artists of `Plotter.general_ohlcv_plot`.
+
+        Args:
+            ohlcv (pd.DataFrame): The OHLCV data of the code.
+        """
+        import matplotlib.dates as mdates
+
+        data = Plotter.get_general_plot_data(
+            ohlcv, self.options["max_points"], self.options["decimation"]
+        )
+        x = mdates.date2num(data["dates"])
+        band_x = mdates.date2num(data["band_dates"])
+        if self.artists is None:
+            (line,) = self.ax.plot(x, data["close"], color="black", alpha=0.1)
+            band = self.ax.fill_between(
+                band_x, data["high"], data["low"], alpha=1
+            )
+            scatter = self.ax.scatter(
+                x, data["close"], color="black", s=data["sizes"], alpha=0.3
+            )
+            self.ax.set_xlabel("Date")
+            self.ax.set_ylabel("Price")
+            self.artists = [line, band, scatter]
+        else:
+            line, band, scatter = self.artists
+            line.set_data(x, data["close"])
+            if hasattr(band, "set_data"):
+                band.set_data(band_x, data["high"], data["low"])
+            else:
+                # fill_between collections cannot be updated before
+                # matplotlib 3.10
+                band.remove()
+                band = self.ax.fill_between(
+                    band_x, data["high"], data["low"], alpha=1
+                )
+                self.artists[1] = band
+            scatter.set_offsets(np.column_stack([x, data["close"]]))
+            scatter.set_sizes(data["sizes"])
+        self._set_limits(band_x, data["low"], data["high"])
+
+    def _update_regression(self, ohlcv: pd.DataFrame) -> None:
+        """
+        Draw or update the artists of `Plotter.draw_regression_plot`.
+
+        Args:
+            ohlcv (pd.DataFrame): The OHLCV data of the code.
+        """
+        slices_data = Plotter.get_regression_plot_data(
+            ohlcv,
+            self.options["slice"],
+            self.options["max_points"],
+            self.options["decimation"],
+        )
+        if self.artists is None:
+            self.artists = []
+            for slice_data in slices_data:
+                (line,) = self.ax.plot(
+                    slice_data["line_x"], slice_data["line_y"]
+                )
+                scatter = self.ax.scatter(
+                    slice_data["x"],
+                    slice_data["y"],
+                    s=slice_data["sizes"],
+                    color=line.get_color(),
+                    alpha=0.5,
+                )
+                self.artists.append((line, scatter))
+        else:
+            for (line, scatter), slice_data in zip(self.artists, slices_data):
+                line.set_data(slice_data["line_x"], slice_data["line_y"])
+                scatter.set_offsets(
+                    np.column_stack([slice_data["x"], slice_data["y"]])
+                )
+                scatter.set_sizes(slice_data["sizes"])
+        x = np.concatenate([slice_data["x"] for slice_data in slices_data])
+        y = np.concatenate(
+            [
+                np.concatenate([slice_data["y"], slice_data["line_y"]])
+                for slice_data in slices_data
+            ]
+        )
+        self._set_limits(x, y, y)
+
+    def _set_limits(
+        self, x: np.ndarray, low: np.ndarray, high: np.ndarray
+    ) -> None:
+        """
+        Fit the axes limits to the data with the default 5% margins, as
+        updated artists do not rescale the axes.
+
+        Args:
+            x (np.ndarray): The x values.
+            low (np.ndarray): The lowest y values.
+            high (np.ndarray): The highest y values.
+        """
+        if len(x) == 0:
+            return
+        x_min, x_max = np.nanmin(x), np.nanmax(x)
+        y_min, y_max = np.nanmin(low), np.nanmax(high)
+        x_margin = (x_max - x_min) * 0.05 or 1
+        y_margin = (y_max - y_min) * 0.05 or abs(y_max) * 0.05 or 1
+        self.ax.set_xlim(x_min - x_margin, x_max + x_margin)
+        self.ax.set_ylim(y_min - y_margin, y_max + y_margin)
+
+
+def _render_chunk(
+    charts: List[Tuple[Any, pd.DataFrame, str]],
+    kind: str,
+    options: Dict[str, Any],
+) -> None:
+    """
+    Render the charts of a chunk of codes with a single reused figure.
+
+    Args:
+        charts (List[Tuple[Any, pd.DataFrame, str]]): The code, OHLCV data and file path of each chart.
+        kind (str): The chart kind, "general" or "regression".
+        options (Dict[str, Any]): The rendering options.
+    """
+    renderer = _ChartRenderer(kind, options)
+    for code, ohlcv, path in charts:
+        renderer.render(code, ohlcv, path)
+
+
+def render_charts(
+    multi_ohlcv: Union[pd.DataFrame, "MultiOhlcvAnalyser"],
+    output_dir: str,
+    codes: List = None,
+    kind: str = "general",
+    start: Union[str, datetime] = None,
+    end: Union[str, datetime] = None,
+    n_jobs: int = 1,
+    executor: Executor = None,
+    slice: int = 1,
+    max_points: int = 2000,
+    decimation: str = "lttb",
+    figsize: Tuple[float, float] = (10, 6),
+    dpi: int = 100,
+    file_format: str = "png",
+) -> Dict[Any, str]:
+    """
+    Render a chart per code into an output directory.
+
+    The charts are drawn with the fast mode of `Plotter` on the Agg backend.
+    Each worker draws its codes on a single figure, updating the data of the
+    artists instead of building a new figure per code, and the codes are
+    split between the workers by number of rows.
+
+    Args:
+        multi_ohlcv (Union[pd.DataFrame, MultiOhlcvAnalyser]): The multi-ohlcv data, or an analyser of it.
+        output_dir (str): The directory of the files, created if missing.
+        codes (List, optional): The codes to render. Defaults to None for every code.
+        kind (str, optional): "general" for `general_ohlcv_plot` or "regression" for `draw_regression_plot`. Defaults to "general".
+        start (Union[str, datetime], optional): The start date. Defaults to None.
+        end (Union[str, datetime], optional): The end date. Defaults to None.
+        n_jobs (int, optional): The number of worker processes. Defaults to 1 to render in this process.
+        executor (Executor, optional): The executor running the workers. Defaults to None for a process pool of n_jobs workers.
+        slice (int, optional): The number of slices of the regression charts. Defaults to 1.
+        max_points (int, optional): The number of points drawn per series. Defaults to 2000.
+        decimation (str, optional): The decimation of long series, "lttb" or "minmax". Defaults to "lttb".
+        figsize (Tuple[float, float], optional): The figure size in inches. Defaults to (10, 6).
+        dpi (int, optional): The resolution in dots per inch. Defaults to 100.
+        file_format (str, optional): The file format and extension. Defaults to "png".
+
+    Returns:
+        Dict[Any, str]: The file path of each code.
+
+    Raises:
+        ValueError: If the kind is unknown or a code has no data.
+    """
+    if kind not in PLOT_KINDS:
+        raise ValueError(
+            f"Unknown chart kind {kind!r}, expected one of {PLOT_KINDS}"
+        )
+    if not isinstance(multi_ohlcv, pd.DataFrame):
+        multi_ohlcv = multi_ohlcv.ohlcv
+    layout = CodeLayout(multi_ohlcv)
+    if codes is None:
+        codes = list(layout.codes)
+    missing_codes = [code for code in codes if code not in layout.codes]
+    if missing_codes:
+        raise ValueError(f"No data for the codes {missing_codes}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    charts = [
+        (
+            code,
+            layout.get_slice(code, start, end),
+            os.path.join(output_dir, f"{code}.{file_format}"),
+        )
+        for code in codes
+    ]
+    options = {
+        "slice": slice,
+        "max_points": max_points,
+        "decimation": decimation,
+        "figsize": figsize,
+        "dpi": dpi,
+        "file_format": file_format,
+    }
+    if not charts:
+        return {}
+    if n_jobs <= 1 and executor is None:
+        _render_chunk(charts, kind, options)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        from ..utils.parallel import split_shards
+
+        counts = np.array([len(ohlcv) for _, ohlcv, _ in charts])
+        offsets = np.cumsum(counts) - counts
+        shards = split_shards(offsets, offsets + counts, max(n_jobs, 1))
+        owned_executor = None
+        if executor is None:
+            executor = owned_executor = ProcessPoolExecutor(n_jobs)
+        try:
+            futures = [
+                executor.submit(_render_chunk, charts[shard], kind, options)
+                for shard in shards
+            ]
+            for future in futures:
+                future.result()
+        finally:
+            if owned_executor is not None:
+                owned_executor.shutdown()
+    return {code: path for code, _, path in charts}
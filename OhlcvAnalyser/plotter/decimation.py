@@ -0,0 +1,112 @@
+import numpy as np
+
+DECIMATION_METHODS = ["lttb", "minmax"]
+
+
+def get_bucket_edges(n: int, n_buckets: int) -> np.ndarray:
+    """
+    Split n points into contiguous buckets of nearly equal size.
+
+    Args:
+        n (int): The number of points.
+        n_buckets (int): The number of buckets, at most n.
+
+    Returns:
+        np.ndarray: The n_buckets + 1 bucket edges, from 0 to n.
+    """
+    return np.linspace(0, n, n_buckets + 1).astype(int)
+
+
+def get_minmax_positions(values: np.ndarray, n_points: int) -> np.ndarray:
+    """
+    Decimate a series by keeping the lowest and the highest point of each
+    bucket, which preserves its visual envelope. NaN points are dropped.
+
+    Args:
+        values (np.ndarray): The values.
+        n_points (int): The maximum number of points to keep.
+
+    Returns:
+        np.ndarray: The sorted positions of the kept points.
+    """
+    positions = np.flatnonzero(~np.isnan(values))
+    n_buckets = n_points // 2
+    if len(positions) <= n_points or n_buckets < 1:
+        return positions
+    edges = get_bucket_edges(len(positions), n_buckets)
+    buckets = np.repeat(np.arange(n_buckets), np.diff(edges))
+    order = np.lexsort((values[positions], buckets))
+    extrema = np.concatenate([order[edges[:-1]], order[edges[1:] - 1]])
+    return positions[np.unique(extrema)]
+
+
+def get_lttb_positions(
+    x: np.ndarray, y: np.ndarray, n_points: int
+) -> np.ndarray:
+    """
+    Decimate a series with Largest-Triangle-Three-Buckets: the first and the
+    last points are kept, and from each bucket in between the point forming
+    the largest triangle with the previously kept point and the average of
+    the next bucket. NaN points are dropped.
+
+    Args:
+        x (np.ndarray): The x values, increasing.
+        y (np.ndarray): The y values.
+        n_points (int): The maximum number of points to keep.
+
+    Returns:
+        np.ndarray: The sorted positions of the kept points.
+    """
+    positions = np.flatnonzero(~np.isnan(y))
+    n = len(positions)
+    if n <= n_points or n_points < 3:
+        return positions
+    x = np.asarray(x, dtype=float)[positions]
+    y = np.asarray(y, dtype=float)[positions]
+    # n_points - 2 buckets between the first and the last point, the last
+    # point being the bucket after the last one
+    edges = np.append(np.linspace(1, n - 1, n_points - 1).astype(int), n)
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x, edges[:-1]) / counts
+    mean_y = np.add.reduceat(y, edges[:-1]) / counts
+    kept = np.empty(n_points, dtype=int)
+    kept[0], kept[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(n_points - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        next_x, next_y = mean_x[bucket + 1], mean_y[bucket + 1]
+        areas = np.abs(
+            (x[previous] - next_x) * (y[lo:hi] - y[previous])
+            - (x[previous] - x[lo:hi]) * (next_y - y[previous])
+        )
+        previous = lo + int(np.argmax(areas))
+        kept[bucket + 1] = previous
+    return positions[kept]
+
+
+def get_decimated_positions(
+    x: np.ndarray, y: np.ndarray, n_points: int, method: str = "lttb"
+) -> np.ndarray:
+    """
+    Decimate a series with one of the `DECIMATION_METHODS`.
+
+    Args:
+        x (np.ndarray): The x values, increasing.
+        y (np.ndarray): The y values.
+        n_points (int): The maximum number of points to keep.
+        method (str, optional): "lttb" or "minmax". Defaults to "lttb".
+
+    Returns:
+        np.ndarray: The sorted positions of the kept points.
+
+    Raises:
+        ValueError: If the method is unknown.
+    """
+    if method == "lttb":
+        return get_lttb_positions(x, y, n_points)
+    if method == "minmax":
+        return get_minmax_positions(np.asarray(y, dtype=float), n_points)
+    raise ValueError(
+        f"Unknown decimation method {method!r}, "
+        f"expected one of {DECIMATION_METHODS}"
+    )
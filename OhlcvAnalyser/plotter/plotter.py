@@ -1,31 +1,115 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-import seaborn as sns
+
+from .decimation import get_bucket_edges, get_decimated_positions
+
+# matplotlib and seaborn are imported on first plot, so that importing the
+# package does not pay for them
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
 
 
 class Plotter:
     @staticmethod
-    def general_ohlcv_plot(ax: plt.Axes, ohlcv: pd.DataFrame) -> plt.Axes:
+    def get_volume_sizes(volume: pd.Series, scale: float = 300) -> pd.Series:
+        """
+        Get the marker sizes of the bars, their min-max normalized volume.
+
+        Args:
+            volume (pd.Series): The volume series.
+            scale (float, optional): The size of the largest volume. Defaults to 300.
+
+        Returns:
+            pd.Series: The marker sizes.
+        """
+        volume_range = volume.max() - volume.min()
+        if not volume_range > 0:
+            return volume * 0.0
+        return (volume - volume.min()) / volume_range * scale
+
+    @staticmethod
+    def get_general_plot_data(
+        ohlcv: pd.DataFrame, max_points: int = None, decimation: str = "lttb"
+    ) -> Dict[str, np.ndarray]:
+        """
+        Get the arrays drawn by `general_ohlcv_plot`.
+
+        Series longer than `max_points` are decimated: the close line and
+        the volume markers keep the points chosen by `decimation`, and the
+        high-low band is reduced to the highest high and the lowest low of
+        each bucket, so spikes stay visible.
+
+        Args:
+            ohlcv (pd.DataFrame): The OHLCV data.
+            max_points (int, optional): The number of points drawn per series. Defaults to None for every point.
+            decimation (str, optional): The decimation of the close, "lttb" or "minmax". Defaults to "lttb".
+
+        Returns:
+            Dict[str, np.ndarray]: The dates, close and marker sizes of the close line, and the dates, high and low of the band.
+        """
+        close = ohlcv["close"].to_numpy(dtype=float)
+        high = ohlcv["high"].to_numpy(dtype=float)
+        low = ohlcv["low"].to_numpy(dtype=float)
+        sizes = Plotter.get_volume_sizes(ohlcv["volume"]).to_numpy()
+        if max_points is None or len(ohlcv) <= max_points:
+            return {
+                "dates": ohlcv.index,
+                "close": close,
+                "sizes": sizes,
+                "band_dates": ohlcv.index,
+                "high": high,
+                "low": low,
+            }
+        positions = get_decimated_positions(
+            np.arange(len(ohlcv)), close, max_points, decimation
+        )
+        bucket_starts = get_bucket_edges(len(ohlcv), max_points)[:-1]
+        return {
+            "dates": ohlcv.index[positions],
+            "close": close[positions],
+            "sizes": sizes[positions],
+            "band_dates": ohlcv.index[bucket_starts],
+            "high": np.fmax.reduceat(high, bucket_starts),
+            "low": np.fmin.reduceat(low, bucket_starts),
+        }
+
+    @staticmethod
+    def general_ohlcv_plot(
+        ax: plt.Axes,
+        ohlcv: pd.DataFrame,
+        fast: bool = False,
+        max_points: int = 2000,
+        decimation: str = "lttb",
+    ) -> plt.Axes:
         """
         Plot the general OHLCV chart.
 
+        In fast mode, series longer than `max_points` are decimated, see
+        `get_general_plot_data`.
+
         Args:
             ax (plt.Axes): The axes to plot the chart on.
             ohlcv (pd.DataFrame): The OHLCV data.
+            fast (bool, optional): Whether to decimate long series. Defaults to False.
+            max_points (int, optional): The number of points drawn per series in fast mode. Defaults to 2000.
+            decimation (str, optional): The decimation of the close, "lttb" or "minmax". Defaults to "lttb".
 
         Returns:
             plt.Axes: The axes with the plotted chart.
         """
-        ax.plot(ohlcv.index, ohlcv["close"], color="black", alpha=0.1)
-        ax.fill_between(ohlcv.index, ohlcv["high"], ohlcv["low"], alpha=1)
+        data = Plotter.get_general_plot_data(
+            ohlcv, max_points if fast else None, decimation
+        )
+        ax.plot(data["dates"], data["close"], color="black", alpha=0.1)
+        ax.fill_between(data["band_dates"], data["high"], data["low"], alpha=1)
         ax.scatter(
-            ohlcv.index,
-            ohlcv["close"],
+            data["dates"],
+            data["close"],
             color="black",
-            s=(ohlcv["volume"] - ohlcv["volume"].min())
-            / (ohlcv["volume"].max() - ohlcv["volume"].min())
-            * 300,
+            s=data["sizes"],
             alpha=0.3,
         )
         ax.set_xlabel("Date")
@@ -33,35 +117,119 @@ class Plotter:
         return ax
 
     @staticmethod
-    def draw_regression_plot(ax: plt.Axes, ohlcv: pd.DataFrame, slice: int = 1) -> plt.Axes:
+    def get_regression_plot_data(
+        ohlcv: pd.DataFrame,
+        slice: int = 1,
+        max_points: int = 2000,
+        decimation: str = "lttb",
+    ) -> List[Dict[str, np.ndarray]]:
         """
-        Draw a regression plot for the OHLCV data.
+        Get the arrays drawn by `draw_regression_plot` in fast mode: per
+        slice, the closed-form least squares line of the close against the
+        date numbers and the scatter decimated to its share of `max_points`.
 
         Args:
-            ax (plt.Axes): The axes to plot the chart on.
             ohlcv (pd.DataFrame): The OHLCV data.
             slice (int, optional): The number of slices to divide the data into. Defaults to 1.
+            max_points (int, optional): The number of scatter points over all slices. Defaults to 2000.
+            decimation (str, optional): The decimation of the scatter, "lttb" or "minmax". Defaults to "lttb".
 
         Returns:
-            plt.Axes: The axes with the plotted chart.
+            List[Dict[str, np.ndarray]]: The x, y and marker sizes of the scatter and the line_x, line_y ends of the line of each slice, the line being empty with fewer than 2 closes.
         """
+        import matplotlib.dates as mdates
+
         window = len(ohlcv) // slice
+        x = mdates.date2num(ohlcv.index)
+        close = ohlcv["close"].to_numpy(dtype=float)
+        sizes = Plotter.get_volume_sizes(ohlcv["volume"]).to_numpy()
+        slices_data = []
         for idx in range(slice):
-            n_volume_series = (
-                (ohlcv["volume"] - ohlcv["volume"].min())
-                / (ohlcv["volume"].max() - ohlcv["volume"].min())
-                * 300
+            rows = np.s_[idx * window : window * (idx + 1)]
+            x_slice, y_slice = x[rows], close[rows]
+            has_value = ~np.isnan(y_slice)
+            x_fit, y_fit = x_slice[has_value], y_slice[has_value]
+            line_x = line_y = np.array([])
+            if len(x_fit) >= 2:
+                x_centered = x_fit - x_fit.mean()
+                slope = (x_centered @ (y_fit - y_fit.mean())) / (
+                    x_centered @ x_centered
+                )
+                line_x = np.array([x_fit[0], x_fit[-1]])
+                line_y = y_fit.mean() + slope * (line_x - x_fit.mean())
+            positions = get_decimated_positions(
+                x_slice, y_slice, max(max_points // slice, 3), decimation
             )
-            _volume = n_volume_series.iloc[idx * window : window * (idx + 1)]
-            _ohlcv = ohlcv.iloc[idx * window : window * (idx + 1)]
-            sns.regplot(
-                x=mdates.date2num(_ohlcv.index),
-                y=_ohlcv["close"],
-                ax=ax,
-                scatter_kws={
-                    "s": _volume,
-                    "alpha": 0.5,
-                },
+            slices_data.append(
+                {
+                    "x": x_slice[positions],
+                    "y": y_slice[positions],
+                    "sizes": sizes[rows][positions],
+                    "line_x": line_x,
+                    "line_y": line_y,
+                }
             )
-        plt.gca().xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m-%d"))
+        return slices_data
+
+    @staticmethod
+    def draw_regression_plot(
+        ax: plt.Axes,
+        ohlcv: pd.DataFrame,
+        slice: int = 1,
+        fast: bool = False,
+        max_points: int = 2000,
+        decimation: str = "lttb",
+    ) -> plt.Axes:
+        """
+        Draw a regression plot for the OHLCV data.
+
+        In fast mode, the fit line of each slice is the closed-form least
+        squares line, without the bootstrapped confidence band of
+        `sns.regplot`, and the scatter of each slice is decimated, see
+        `get_regression_plot_data`.
+
+        Args:
+            ax (plt.Axes): The axes to plot the chart on.
+            ohlcv (pd.DataFrame): The OHLCV data.
+            slice (int, optional): The number of slices to divide the data into. Defaults to 1.
+            fast (bool, optional): Whether to draw closed-form fits of decimated scatters. Defaults to False.
+            max_points (int, optional): The number of scatter points drawn over all slices in fast mode. Defaults to 2000.
+            decimation (str, optional): The decimation of the scatter, "lttb" or "minmax". Defaults to "lttb".
+
+        Returns:
+            plt.Axes: The axes with the plotted chart.
+        """
+        import matplotlib.dates as mdates
+
+        if fast:
+            for slice_data in Plotter.get_regression_plot_data(
+                ohlcv, slice, max_points, decimation
+            ):
+                # The line takes the next color of the axes, as regplot does
+                (line,) = ax.plot(slice_data["line_x"], slice_data["line_y"])
+                ax.scatter(
+                    slice_data["x"],
+                    slice_data["y"],
+                    s=slice_data["sizes"],
+                    color=line.get_color(),
+                    alpha=0.5,
+                )
+        else:
+            import seaborn as sns
+
+            window = len(ohlcv) // slice
+            x = mdates.date2num(ohlcv.index)
+            volume_sizes = Plotter.get_volume_sizes(ohlcv["volume"])
+            for idx in range(slice):
+                rows = np.s_[idx * window : window * (idx + 1)]
+                sns.regplot(
+                    x=x[rows],
+                    y=ohlcv["close"].iloc[rows],
+                    ax=ax,
+                    scatter_kws={
+                        "s": volume_sizes.iloc[rows],
+                        "alpha": 0.5,
+                    },
+                )
+        ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m-%d"))
         return ax
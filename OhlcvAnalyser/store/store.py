@@ -0,0 +1,117 @@
+import json
+import os
+from typing import List
+import numpy as np
+import pandas as pd
+
+from ..utils import CodeLayout
+from ..utils.segment import get_segment_rows
+
+META_FILE = "meta.json"
+DATE_FILE = "date.npy"
+OFFSETS_FILE = "offsets.npy"
+
+
+class OhlcvStore:
+    def __init__(self, path: str) -> None:
+        """
+        Open an ohlcv store written by `OhlcvStore.write`.
+
+        The column arrays are memory-mapped, so only the rows that a `load`
+        call selects are read from disk.
+
+        Args:
+            path (str): The directory of the store.
+        """
+        self.path = path
+        with open(os.path.join(path, META_FILE)) as f:
+            meta = json.load(f)
+        self.codes = pd.Index(meta["codes"], name="code")
+        self.columns = meta["columns"]
+        self.index_name = meta["index_name"]
+        self.offsets = np.load(os.path.join(path, OFFSETS_FILE))
+        self.dates = np.load(os.path.join(path, DATE_FILE), mmap_mode="r")
+        self.arrays = {
+            column: np.load(os.path.join(path, f"{column}.npy"), mmap_mode="r")
+            for column in self.columns
+        }
+
+    @staticmethod
+    def write(ohlcv: pd.DataFrame, path: str) -> "OhlcvStore":
+        """
+        Write multi-ohlcv data to a store, one array per column with the rows
+        of every code contiguous and sorted by date.
+
+        Args:
+            ohlcv (pd.DataFrame): The multi-ohlcv data indexed by date.
+            path (str): The directory of the store. It is created if missing.
+
+        Returns:
+            OhlcvStore: The opened store.
+        """
+        os.makedirs(path, exist_ok=True)
+        layout = CodeLayout(ohlcv)
+        columns = [column for column in ohlcv.columns if column != "code"]
+        np.save(
+            os.path.join(path, DATE_FILE),
+            np.asarray(layout.ohlcv.index, dtype="datetime64[ns]"),
+        )
+        np.save(os.path.join(path, OFFSETS_FILE), layout.offsets)
+        for column in columns:
+            np.save(
+                os.path.join(path, f"{column}.npy"),
+                layout.ohlcv[column].to_numpy(),
+            )
+        meta = {
+            "codes": layout.codes.astype(object).tolist(),
+            "columns": columns,
+            "index_name": ohlcv.index.name,
+        }
+        with open(os.path.join(path, META_FILE), "w") as f:
+            json.dump(meta, f)
+        return OhlcvStore(path)
+
+    def load(self, codes: List = None, start=None, end=None) -> pd.DataFrame:
+        """
+        Load the rows of some codes within a date range.
+
+        Args:
+            codes (List, optional): The codes to load. Defaults to all codes.
+            start (optional): The start date. Defaults to None.
+            end (optional): The end date. Defaults to None.
+
+        Returns:
+            pd.DataFrame: The multi-ohlcv data, sorted by (code, date).
+        """
+        code_ids = (
+            np.arange(len(self.codes))
+            if codes is None
+            else self.codes.get_indexer(pd.Index(codes).unique())
+        )
+        if (code_ids < 0).any():
+            raise KeyError("Some codes are not in the store")
+        code_ids = np.sort(code_ids)
+
+        lo = self.offsets[code_ids].copy()
+        hi = self.offsets[code_ids + 1].copy()
+        for idx, code_id in enumerate(code_ids):
+            # Only O(log n) pages of each code's dates are touched
+            dates = self.dates[lo[idx] : hi[idx]]
+            offset = self.offsets[code_id]
+            if start is not None:
+                lo[idx] = offset + np.searchsorted(
+                    dates, np.datetime64(pd.Timestamp(start)), "left"
+                )
+            if end is not None:
+                hi[idx] = offset + np.searchsorted(
+                    dates, np.datetime64(pd.Timestamp(end)), "right"
+                )
+        hi = np.maximum(lo, hi)
+
+        rows, ids = get_segment_rows(lo, hi)
+        ohlcv = pd.DataFrame(
+            {column: self.arrays[column][rows] for column in self.columns},
+            index=pd.DatetimeIndex(self.dates[rows], name=self.index_name),
+        )
+        ohlcv["code"] = self.codes[code_ids].to_numpy()[ids]
+        return ohlcv
@@ -1 +1,7 @@
-from .date import filter_date
\ No newline at end of file
+from .cache import ResultCache
+from .compact import compact_ohlcv
+from .date import filter_date, get_date_bounds
+from .layout import CodeLayout
+from .profiling import Profiler, StageRecord
+from .resample import ResamplePyramid, resample_ohlcv
+from .sparse import SparseTable
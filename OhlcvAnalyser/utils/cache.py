@@ -0,0 +1,236 @@
+import functools
+import inspect
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+import pandas as pd
+
+DATE_PARAMETERS = ("start", "end")
+
+# Returned by `ResultCache.lookup` for a missing key, as None is a valid result
+MISSING = object()
+
+
+def get_result_size(result: Any) -> int:
+    """
+    Get the memory footprint of a cached result in bytes.
+
+    Args:
+        result (Any): A pandas object, or any other value counted as 0 bytes.
+
+    Returns:
+        int: The size of the result in bytes.
+    """
+    if isinstance(result, (pd.Series, pd.DataFrame, pd.Index)):
+        return int(pd.Series(result.memory_usage(deep=True)).sum())
+    return 0
+
+
+def copy_result(result: Any) -> Any:
+    """
+    Copy a result so that callers cannot mutate the cached value.
+
+    Args:
+        result (Any): The result.
+
+    Returns:
+        Any: A deep copy of a pandas object, or the result itself otherwise.
+    """
+    if isinstance(result, (pd.Series, pd.DataFrame)):
+        return result.copy()
+    return result
+
+
+class ResultCache:
+    def __init__(self, maxsize: int = 128, max_bytes: int = None) -> None:
+        """
+        A least recently used cache of analyser results, safe to share
+        between threads.
+
+        Args:
+            maxsize (int): The maximum number of results. Defaults to 128.
+            max_bytes (int, optional): The maximum total size of the results in bytes. Defaults to None for no memory budget.
+        """
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._results
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Get a result and mark it as the most recently used.
+
+        Args:
+            key (Hashable): The result key.
+
+        Returns:
+            Any: The cached result.
+
+        Raises:
+            KeyError: If the result is not cached.
+        """
+        with self._lock:
+            result, _ = self._results[key]
+            self._results.move_to_end(key)
+            return result
+
+    def lookup(self, key: Hashable) -> Any:
+        """
+        Get a result if it is cached, counting the hit or the miss.
+
+        Args:
+            key (Hashable): The result key.
+
+        Returns:
+            Any: The cached result, or `MISSING` if it is not cached.
+        """
+        with self._lock:
+            if key not in self._results:
+                self.misses += 1
+                return MISSING
+            self.hits += 1
+            result, _ = self._results[key]
+            self._results.move_to_end(key)
+            return result
+
+    def put(self, key: Hashable, result: Any) -> None:
+        """
+        Cache a result, evicting the least recently used results that no
+        longer fit. A result larger than the memory budget is not cached.
+
+        Args:
+            key (Hashable): The result key.
+            result (Any): The result.
+        """
+        size = get_result_size(result)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._results:
+                self.nbytes -= self._results.pop(key)[1]
+            self._results[key] = (result, size)
+            self.nbytes += size
+            while len(self._results) > self.maxsize or (
+                self.max_bytes is not None and self.nbytes > self.max_bytes
+            ):
+                self.nbytes -= self._results.popitem(last=False)[1][1]
+
+    def clear(self) -> None:
+        """
+        Drop every cached result, keeping the hit and miss counters.
+        """
+        with self._lock:
+            self._results.clear()
+            self.nbytes = 0
+
+    def info(self) -> Dict[str, int]:
+        """
+        Get the cache statistics.
+
+        Returns:
+            Dict[str, int]: The hits, misses, number of results, maxsize and size in bytes.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._results),
+                "maxsize": self.maxsize,
+                "nbytes": self.nbytes,
+            }
+
+
+def _normalize_argument(name: str, value: Any) -> Hashable:
+    """
+    Normalize an argument into a hashable part of a cache key, so that
+    equivalent date spellings share the same result.
+
+    Args:
+        name (str): The parameter name.
+        value (Any): The argument.
+
+    Returns:
+        Hashable: The normalized argument.
+    """
+    if name in DATE_PARAMETERS:
+        # The date filters treat every falsy bound as no bound
+        return pd.Timestamp(value) if value else None
+    if isinstance(value, list):
+        return tuple(value)
+    if isinstance(value, dict):
+        return tuple(
+            sorted(
+                (key, _normalize_argument(key, item))
+                for key, item in value.items()
+            )
+        )
+    return value
+
+
+def get_result_key(
+    name: str,
+    signature: inspect.Signature,
+    args: tuple,
+    kwargs: Dict[str, Any],
+) -> Tuple[Hashable, ...]:
+    """
+    Get the key of an analyser method call: the method name and its bound
+    arguments, with the start and end dates normalized to timestamps.
+
+    Args:
+        name (str): The method name.
+        signature (inspect.Signature): The method signature, including self.
+        args (tuple): The positional arguments, excluding self.
+        kwargs (Dict[str, Any]): The keyword arguments.
+
+    Returns:
+        Tuple[Hashable, ...]: The call key.
+    """
+    bound = signature.bind(None, *args, **kwargs)
+    bound.apply_defaults()
+    return (name,) + tuple(
+        _normalize_argument(name, value)
+        for name, value in list(bound.arguments.items())[1:]
+    )
+
+
+def cached_result(method: Callable) -> Callable:
+    """
+    Decorate an analyser method so that its results are served from the
+    analyser's `_cache` when it has one.
+
+    The key is the method name and its bound arguments, with the start and
+    end dates normalized to timestamps. Callers receive copies of the cached
+    results.
+
+    Args:
+        method (Callable): The analyser method.
+
+    Returns:
+        Callable: The cached method.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = self._cache
+        if cache is None:
+            return method(self, *args, **kwargs)
+        key = get_result_key(method.__name__, signature, args, kwargs)
+        result = cache.lookup(key)
+        if result is not MISSING:
+            return copy_result(result)
+        result = method(self, *args, **kwargs)
+        cache.put(key, copy_result(result))
+        return result
+
+    return wrapper
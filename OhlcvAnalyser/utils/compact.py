@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+PRICE_COLUMNS = ["open", "high", "low", "close"]
+
+
+def compact_ohlcv(ohlcv: pd.DataFrame) -> pd.DataFrame:
+    """
+    Get a compact copy of ohlcv data.
+
+    Codes become categorical, prices become float32 and an integral,
+    non-negative volume becomes the smallest unsigned integer dtype that holds
+    it (float32 otherwise). Computations still accumulate in float64, but
+    float32 keeps about 7 significant digits of each price, so results agree
+    with float64 data to a relative tolerance of about 1e-5, and rounded
+    percentages such as profit may differ in their last digit.
+
+    Args:
+        ohlcv (pd.DataFrame): The ohlcv data.
+
+    Returns:
+        pd.DataFrame: The compact ohlcv data.
+    """
+    dtypes = {
+        column: np.float32 for column in PRICE_COLUMNS if column in ohlcv
+    }
+    if "code" in ohlcv:
+        dtypes["code"] = "category"
+    if "volume" in ohlcv:
+        volume = ohlcv["volume"].to_numpy()
+        is_integral = (
+            len(volume) > 0
+            and np.isfinite(volume).all()
+            and (volume >= 0).all()
+            and (volume == np.round(volume)).all()
+        )
+        dtypes["volume"] = (
+            np.min_scalar_type(int(volume.max()))
+            if is_integral
+            else np.float32
+        )
+    compact_ohlcv_df = ohlcv.astype(dtypes)
+    return compact_ohlcv_df
@@ -1,5 +1,41 @@
+def get_date_bounds(index, start, end):
+    """
+    Get the [lo, hi) row bounds of the dates within [start, end] with two
+    binary searches.
+
+    Args:
+        index (pd.Index): The date-sorted index.
+        start: The start date, or None for no lower bound.
+        end: The end date, or None for no upper bound.
+
+    Returns:
+        Tuple[int, int]: The lo and hi row bounds, lo <= hi.
+    """
+    lo = index.searchsorted(start, "left") if start else 0
+    hi = index.searchsorted(end, "right") if end else len(index)
+    return lo, max(lo, hi)
+
+
 def filter_date(ohlcv, start, end):
-    filtered_ohlcv = ohlcv.copy()
+    """
+    Filter ohlcv data to the rows whose date is within [start, end].
+
+    A date-sorted index is cut with two binary searches and returned as a
+    slice of the input without copying it; any other index falls back to
+    boolean masks.
+
+    Args:
+        ohlcv (pd.DataFrame): The ohlcv data indexed by date.
+        start: The start date, or None for no lower bound.
+        end: The end date, or None for no upper bound.
+
+    Returns:
+        pd.DataFrame: The filtered ohlcv data.
+    """
+    if ohlcv.index.is_monotonic_increasing:
+        lo, hi = get_date_bounds(ohlcv.index, start, end)
+        return ohlcv.iloc[lo:hi]
+    filtered_ohlcv = ohlcv
     if start:
         filtered_ohlcv = filtered_ohlcv[start <= filtered_ohlcv.index]
     if end:
@@ -0,0 +1,75 @@
+from typing import Tuple
+import numpy as np
+import pandas as pd
+
+
+class CodeLayout:
+    def __init__(self, ohlcv: pd.DataFrame) -> None:
+        """
+        Sort long-format ohlcv data once by (code, date) and index the
+        contiguous block of rows that belongs to each code.
+
+        Args:
+            ohlcv (pd.DataFrame): The multi-ohlcv data with a "code" column.
+        """
+        code_ids, codes = pd.factorize(ohlcv["code"], sort=True)
+        date_ids, dates = pd.factorize(ohlcv.index, sort=True)
+        order = np.lexsort((date_ids, code_ids))
+
+        self.ohlcv = ohlcv.iloc[order]
+        self.codes = pd.Index(codes, name="code")
+        self.dates = pd.Index(dates)
+        self.offsets = np.concatenate(
+            ([0], np.cumsum(np.bincount(code_ids, minlength=len(codes))))
+        )
+        # (code, date) rank of every row, ascending because of the sort above
+        self.keys = (
+            code_ids[order].astype(np.int64) * len(dates) + date_ids[order]
+        )
+
+    def get_bounds(
+        self, start=None, end=None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the [lo, hi) row bounds of every code within a date range.
+
+        Args:
+            start (optional): The start date. Defaults to None.
+            end (optional): The end date. Defaults to None.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The lo and hi row bounds per code.
+        """
+        start_rank = (
+            0 if start is None else self.dates.searchsorted(start, "left")
+        )
+        end_rank = (
+            len(self.dates)
+            if end is None
+            else self.dates.searchsorted(end, "right")
+        )
+        base = np.arange(len(self.codes), dtype=np.int64) * len(self.dates)
+        lo = self.keys.searchsorted(base + start_rank, "left")
+        hi = self.keys.searchsorted(base + max(start_rank, end_rank), "left")
+        return lo, hi
+
+    def get_slice(self, code, start=None, end=None) -> pd.DataFrame:
+        """
+        Get the ohlcv rows of a single code as a slice of the sorted data.
+
+        Args:
+            code: The stock code.
+            start (optional): The start date. Defaults to None.
+            end (optional): The end date. Defaults to None.
+
+        Returns:
+            pd.DataFrame: The ohlcv data of the code.
+        """
+        code_id = self.codes.get_loc(code)
+        lo, hi = self.offsets[code_id], self.offsets[code_id + 1]
+        dates = self.ohlcv.index[lo:hi]
+        if start is not None:
+            lo += dates.searchsorted(start, "left")
+        if end is not None:
+            hi = self.offsets[code_id] + dates.searchsorted(end, "right")
+        return self.ohlcv.iloc[lo : max(lo, hi)]
@@ -0,0 +1,147 @@
+from typing import Dict, List, Tuple
+import numpy as np
+
+from ..analyser import CoefficientAnalyser, ProfitAnalyser
+from ..backend import get_backend
+
+COEF_METRICS = ["coef", "normalized_coef", "coef_score"]
+RANGE_METRICS = ["max_profit", "min_profit", "max_drawdown"]
+VARIANCE_METRICS = {
+    "oc_variance": ("open", "close"),
+    "hl_variance": ("high", "low"),
+}
+
+# Relative cost of a metric per row, used to evaluate cheap filters first
+METRIC_COSTS = {
+    "profit": 0,
+    "max_profit": 1,
+    "min_profit": 1,
+    "max_drawdown": 2,
+    "oc_variance": 3,
+    "hl_variance": 3,
+    "coef": 4,
+    "normalized_coef": 4,
+    "coef_score": 4,
+}
+
+Metric = Tuple[str, str]
+
+
+def parse_metric_name(name: str) -> Metric:
+    """
+    Parse a metric name as the analysers name their results, e.g.
+    "close_normalized_coef", "profit" or "oc_variance".
+
+    Args:
+        name (str): The metric name.
+
+    Returns:
+        Metric: The (metric, arg) pair.
+
+    Raises:
+        ValueError: If the name is not a known metric.
+    """
+    if name == "profit" or name in RANGE_METRICS:
+        return (name, "close")
+    if name in VARIANCE_METRICS:
+        return (name, None)
+    for metric in sorted(COEF_METRICS, key=len, reverse=True):
+        if name.endswith(f"_{metric}"):
+            return (metric, name[: -len(metric) - 1])
+    raise ValueError(f"Unknown metric: {name}")
+
+
+def get_metric_columns(metrics: List[Metric]) -> List[str]:
+    """
+    Get the columns needed to compute some metrics.
+
+    Args:
+        metrics (List[Metric]): The (metric, arg) pairs, arg being None for the variances.
+
+    Returns:
+        List[str]: The column names.
+    """
+    columns = []
+    for metric, arg in metrics:
+        columns.extend(VARIANCE_METRICS.get(metric, [arg]))
+    return list(dict.fromkeys(columns))
+
+
+def get_segment_metrics(
+    values: Dict[str, np.ndarray],
+    lo: np.ndarray,
+    hi: np.ndarray,
+    metrics: List[Metric],
+    backend: str = None,
+) -> Dict[Metric, np.ndarray]:
+    """
+    Compute per-segment metrics with the segment kernels of a backend,
+    sharing the regression sums between the metrics that need them.
+
+    The metrics are "coef", "normalized_coef", "coef_score", "profit",
+    "max_profit", "min_profit" and "max_drawdown" of an arg, and
+    "oc_variance" and "hl_variance".
+
+    Args:
+        values (Dict[str, np.ndarray]): The column values, see `get_metric_columns`.
+        lo (np.ndarray): The first row of each segment.
+        hi (np.ndarray): One past the last row of each segment.
+        metrics (List[Metric]): The (metric, arg) pairs, arg being None for the variances.
+        backend (str, optional): The backend name. Defaults to None for the global default.
+
+    Returns:
+        Dict[Metric, np.ndarray]: The values of each metric per segment.
+    """
+    kernels = get_backend(backend)(lo, hi)
+    regression_sums = {}
+    results = {}
+    for metric, arg in metrics:
+        if metric == "profit":
+            buying_price = values[arg][lo].astype(float)
+            selling_price = values[arg][hi - 1].astype(float)
+            results[(metric, arg)] = ProfitAnalyser.calc_pct(
+                (selling_price - buying_price) / buying_price
+            )
+        elif metric in RANGE_METRICS:
+            if metric == "max_drawdown":
+                change = kernels.min_ratio(values[arg]) - 1
+            else:
+                buying_price = values[arg][lo].astype(float)
+                price = (
+                    kernels.range_max(values[arg])
+                    if metric == "max_profit"
+                    else kernels.range_min(values[arg])
+                )
+                change = (price - buying_price) / buying_price
+            results[(metric, arg)] = ProfitAnalyser.calc_pct(change)
+        elif metric in VARIANCE_METRICS:
+            a_arg, b_arg = VARIANCE_METRICS[metric]
+            count, _, m2 = kernels.normalized_diff_moments(
+                values[a_arg], values[b_arg]
+            )
+            with np.errstate(divide="ignore", invalid="ignore"):
+                results[(metric, arg)] = np.where(
+                    count > 1, m2 / (count - 1), np.nan
+                )
+        elif metric in COEF_METRICS:
+            if arg not in regression_sums:
+                regression_sums[arg] = kernels.regression_sums(values[arg])
+            sums = regression_sums[arg]
+            if metric == "coef":
+                result = CoefficientAnalyser.get_coefficient_from_sums(
+                    *sums[:5]
+                )
+            elif metric == "normalized_coef":
+                result = (
+                    CoefficientAnalyser.get_normalized_coefficient_from_sums(
+                        *sums[:5]
+                    )
+                )
+            else:
+                result = CoefficientAnalyser.get_coefficient_score_from_sums(
+                    *sums
+                )
+            results[(metric, arg)] = result
+        else:
+            raise ValueError(f"Unknown metric: {metric}")
+    return results
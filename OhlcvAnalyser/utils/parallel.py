@@ -0,0 +1,192 @@
+from concurrent.futures import Executor
+from multiprocessing import shared_memory
+from typing import Dict, List, Tuple
+import numpy as np
+
+from ..backend import get_backend_name
+from .metrics import Metric, get_segment_metrics
+
+Descriptor = Tuple[str, Tuple[int, ...], str]
+
+
+class SharedColumns:
+    def __init__(self) -> None:
+        """
+        Hold numpy columns copied into shared memory, so that worker
+        processes attach to them by name instead of receiving pickled data.
+        """
+        self._blocks = {}
+
+    def get_descriptor(self, column: str, values: np.ndarray) -> Descriptor:
+        """
+        Get the descriptor of a column, copying it into shared memory the
+        first time it is requested.
+
+        Args:
+            column (str): The column name.
+            values (np.ndarray): The column values.
+
+        Returns:
+            Descriptor: The block name, shape and dtype of the shared column.
+        """
+        if column not in self._blocks:
+            values = np.ascontiguousarray(values)
+            block = shared_memory.SharedMemory(
+                create=True, size=max(values.nbytes, 1)
+            )
+            np.ndarray(values.shape, values.dtype, buffer=block.buf)[:] = (
+                values
+            )
+            self._blocks[column] = (
+                block,
+                (block.name, values.shape, values.dtype.str),
+            )
+        return self._blocks[column][1]
+
+    def close(self) -> None:
+        """
+        Release every shared memory block.
+        """
+        for block, _ in self._blocks.values():
+            block.close()
+            block.unlink()
+        self._blocks = {}
+
+
+def _attach(
+    descriptor: Descriptor,
+) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    """
+    Attach to a shared column inside a worker process.
+
+    Args:
+        descriptor (Descriptor): The block name, shape and dtype of the shared column.
+
+    Returns:
+        Tuple[shared_memory.SharedMemory, np.ndarray]: The block, to close once the values are no longer used, and the column values.
+    """
+    name, shape, dtype = descriptor
+    # Workers share the resource tracker of the creating process, which owns
+    # the block and unlinks it
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype, buffer=block.buf)
+
+
+def _get_shard_metrics(
+    descriptors: Dict[str, Descriptor],
+    lo: np.ndarray,
+    hi: np.ndarray,
+    metrics: List[Metric],
+    backend: str,
+) -> Dict[Metric, np.ndarray]:
+    """
+    Compute the metrics of one shard of segments inside a worker process.
+
+    The shared columns are attached for the task only and closed before it
+    returns, so long-lived workers do not keep the blocks of replaced
+    columns mapped after the analyser data changes.
+
+    Args:
+        descriptors (Dict[str, Descriptor]): The shared columns by name.
+        lo (np.ndarray): The first row of each segment of the shard.
+        hi (np.ndarray): One past the last row of each segment of the shard.
+        metrics (List[Metric]): The (metric, arg) pairs.
+        backend (str): The backend name.
+
+    Returns:
+        Dict[Metric, np.ndarray]: The values of each metric per segment.
+    """
+    blocks = []
+    values = {}
+    try:
+        for column, descriptor in descriptors.items():
+            block, values[column] = _attach(descriptor)
+            blocks.append(block)
+        results = get_segment_metrics(values, lo, hi, metrics, backend)
+        # Copied, so that no result is a view of a block about to be closed
+        shard_results = {
+            metric: np.array(result) for metric, result in results.items()
+        }
+        del results
+    finally:
+        values.clear()
+        for block in blocks:
+            try:
+                block.close()
+            except BufferError:
+                # The traceback of an exception still holds views of the
+                # block, which is closed once they are collected
+                pass
+    return shard_results
+
+
+def split_shards(lo: np.ndarray, hi: np.ndarray, n_shards: int) -> List[slice]:
+    """
+    Split consecutive segments into shards holding about the same number of rows.
+
+    Args:
+        lo (np.ndarray): The first row of each segment.
+        hi (np.ndarray): One past the last row of each segment.
+        n_shards (int): The number of shards.
+
+    Returns:
+        List[slice]: The non-empty segment slices of the shards.
+    """
+    counts = hi - lo
+    # A segment goes to the shard that holds its middle row
+    middle_rows = np.cumsum(counts) - counts / 2
+    targets = counts.sum() * np.arange(1, n_shards) / n_shards
+    bounds = np.concatenate(
+        ([0], np.searchsorted(middle_rows, targets), [len(lo)])
+    )
+    return [
+        slice(start, stop)
+        for start, stop in zip(bounds[:-1], bounds[1:])
+        if start < stop
+    ]
+
+
+def get_sharded_metrics(
+    executor: Executor,
+    descriptors: Dict[str, Descriptor],
+    lo: np.ndarray,
+    hi: np.ndarray,
+    metrics: List[Metric],
+    n_shards: int,
+    backend: str = None,
+) -> Dict[Metric, np.ndarray]:
+    """
+    Compute per-segment metrics on an executor, one task per shard of
+    segments, and merge the shard results back in segment order.
+
+    Args:
+        executor (Executor): The executor, usually a process pool.
+        descriptors (Dict[str, Descriptor]): The shared columns by name.
+        lo (np.ndarray): The first row of each segment.
+        hi (np.ndarray): One past the last row of each segment.
+        metrics (List[Metric]): The (metric, arg) pairs.
+        n_shards (int): The number of shards.
+        backend (str, optional): The backend name. Defaults to None for the global default of this process.
+
+    Returns:
+        Dict[Metric, np.ndarray]: The values of each metric per segment.
+    """
+    futures = [
+        executor.submit(
+            _get_shard_metrics,
+            descriptors,
+            lo[shard],
+            hi[shard],
+            metrics,
+            get_backend_name(backend),
+        )
+        for shard in split_shards(lo, hi, n_shards)
+    ]
+    shard_results = [future.result() for future in futures]
+    results = {
+        metric: np.concatenate(
+            [shard_result[metric] for shard_result in shard_results]
+        )
+        for metric in metrics
+    }
+    return results
@@ -0,0 +1,319 @@
+from typing import Dict, List, Tuple
+import numpy as np
+import pandas as pd
+
+from ..analyser import CoefficientAnalyser, ProfitAnalyser, VarianceAnalyser
+from .layout import CodeLayout
+from .sparse import SparseTable
+from .metrics import (
+    COEF_METRICS,
+    RANGE_METRICS,
+    VARIANCE_METRICS,
+    Metric,
+    get_segment_metrics,
+)
+
+
+class PrefixSumIndex:
+    def __init__(self, layout: CodeLayout) -> None:
+        """
+        Per-code cumulative sums over the rows of a code layout, so that the
+        regression sums and the variance moments of any contiguous block of
+        rows are the difference of two prefix values.
+
+        The prefix sums restart at every code, and x and the values are
+        centered per code, to keep the differences from cancelling. The
+        range min, max and drawdown come from a `SparseTable` instead. The
+        columns are indexed on first use.
+
+        Args:
+            layout (CodeLayout): The code layout of the ohlcv data.
+        """
+        counts = np.diff(layout.offsets)
+        self.layout = layout
+        self.code_ids = np.repeat(np.arange(len(counts)), counts)
+        # Position of each row within its code, centered on the middle row
+        self.positions = np.arange(len(self.code_ids)) - np.repeat(
+            layout.offsets[:-1] + (counts - 1) / 2, counts
+        )
+        self._prefixes = {}
+        self._sparse_tables = {}
+
+    def _get_cumsum(self, values: np.ndarray) -> np.ndarray:
+        """
+        Get the inclusive cumulative sums of values, restarting at each code.
+
+        Args:
+            values (np.ndarray): The values of every row.
+
+        Returns:
+            np.ndarray: The cumulative sums.
+        """
+        return (
+            pd.Series(values, dtype=float)
+            .groupby(self.code_ids)
+            .cumsum()
+            .to_numpy()
+        )
+
+    def _get_code_means(self, values: np.ndarray) -> np.ndarray:
+        """
+        Get the mean of the code of every row, skipping NaN.
+
+        Args:
+            values (np.ndarray): The values of every row.
+
+        Returns:
+            np.ndarray: The code mean of each row.
+        """
+        return (
+            pd.Series(values, dtype=float)
+            .groupby(self.code_ids)
+            .transform("mean")
+            .to_numpy()
+        )
+
+    def _get_prefix(self, name: str) -> Dict[str, np.ndarray]:
+        """
+        Get the prefix sums of a column, building them on first use.
+
+        The regression columns hold the code means and the prefix sums of x,
+        y, x * y, x * x and y * y; the variance metrics hold the code means
+        and the prefix sums of the count, the values and their squares. The
+        code means are taken over the finite values, which alone enter the
+        sums, and "n_invalid" counts the rows that make a window NaN, as in
+        `get_segment_metrics`: NaN or inf values for the regressions, inf
+        values for the variances, whose NaN values are skipped.
+
+        Args:
+            name (str): A column name, or "oc_variance" or "hl_variance".
+
+        Returns:
+            Dict[str, np.ndarray]: The code means and prefix sums by name.
+        """
+        if name in self._prefixes:
+            return self._prefixes[name]
+        ohlcv = self.layout.ohlcv
+        if name in VARIANCE_METRICS:
+            a_arg, b_arg = VARIANCE_METRICS[name]
+            values = VarianceAnalyser.get_normalized_diff_series(
+                ohlcv[a_arg].to_numpy(dtype=float),
+                ohlcv[b_arg].to_numpy(dtype=float),
+            )
+            is_finite = np.isfinite(values)
+            shift = self._get_code_means(np.where(is_finite, values, np.nan))
+            centered = np.where(is_finite, values - shift, 0.0)
+            prefix = {
+                "shift": shift,
+                "n_invalid": self._get_cumsum(np.isinf(values)),
+                "count": self._get_cumsum(is_finite),
+                "sum_y": self._get_cumsum(centered),
+                "sum_yy": self._get_cumsum(centered * centered),
+            }
+        else:
+            values = ohlcv[name].to_numpy(dtype=float)
+            x = self.positions
+            is_finite = np.isfinite(values)
+            shift = self._get_code_means(np.where(is_finite, values, np.nan))
+            centered = np.where(is_finite, values - shift, 0.0)
+            prefix = {
+                "shift": shift,
+                "n_invalid": self._get_cumsum(~is_finite),
+                "sum_x": self._get_cumsum(x),
+                "sum_y": self._get_cumsum(centered),
+                "sum_xy": self._get_cumsum(x * centered),
+                "sum_xx": self._get_cumsum(x * x),
+                "sum_yy": self._get_cumsum(centered * centered),
+            }
+        self._prefixes[name] = prefix
+        return prefix
+
+    def _get_sparse_table(self, arg: str) -> SparseTable:
+        """
+        Get the sparse table of a column, building it on first use.
+
+        Args:
+            arg (str): The column name.
+
+        Returns:
+            SparseTable: The sparse table of the column.
+        """
+        if arg not in self._sparse_tables:
+            # Windows never cross codes, so the longest code bounds them
+            self._sparse_tables[arg] = SparseTable(
+                self.layout.ohlcv[arg].to_numpy(dtype=float),
+                int(np.diff(self.layout.offsets).max(initial=0)),
+            )
+        return self._sparse_tables[arg]
+
+    def _get_range_metric(
+        self, metric: str, arg: str, lo: np.ndarray, hi: np.ndarray
+    ) -> np.ndarray:
+        """
+        Get the max profit, min profit or max drawdown of an arg over row
+        windows.
+
+        Args:
+            metric (str): "max_profit", "min_profit" or "max_drawdown".
+            arg (str): The column name.
+            lo (np.ndarray): The first row of each window.
+            hi (np.ndarray): One past the last row of each window.
+
+        Returns:
+            np.ndarray: The metric values.
+        """
+        table = self._get_sparse_table(arg)
+        if metric == "max_drawdown":
+            change = table.get_min_ratio(lo, hi) - 1
+        else:
+            buying_price = self.layout.ohlcv[arg].to_numpy(dtype=float)[lo]
+            price = (
+                table.get_max(lo, hi)
+                if metric == "max_profit"
+                else table.get_min(lo, hi)
+            )
+            change = (price - buying_price) / buying_price
+        return ProfitAnalyser.calc_pct(change)
+
+    def _get_window_sums(
+        self, prefix: np.ndarray, lo: np.ndarray, hi: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the sums over non-empty [lo, hi) row windows within single codes.
+
+        Args:
+            prefix (np.ndarray): The prefix sums.
+            lo (np.ndarray): The first row of each window.
+            hi (np.ndarray): One past the last row of each window.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The window sums, and the magnitude of the two prefix values they are taken from.
+        """
+        before = np.maximum(lo - 1, 0)
+        has_before = (lo > 0) & (self.code_ids[before] == self.code_ids[lo])
+        prefix_before = np.where(has_before, prefix[before], 0.0)
+        prefix_last = prefix[hi - 1]
+        return (
+            prefix_last - prefix_before,
+            np.abs(prefix_last) + np.abs(prefix_before),
+        )
+
+    def _get_coef_metric(
+        self, metric: str, arg: str, lo: np.ndarray, hi: np.ndarray
+    ) -> np.ndarray:
+        """
+        Get a coefficient metric of an arg over row windows.
+
+        Args:
+            metric (str): "coef", "normalized_coef" or "coef_score".
+            arg (str): The column name.
+            lo (np.ndarray): The first row of each window.
+            hi (np.ndarray): One past the last row of each window.
+
+        Returns:
+            np.ndarray: The metric values.
+        """
+        prefix = self._get_prefix(arg)
+        n = (hi - lo).astype(float)
+        n_invalid, _ = self._get_window_sums(prefix["n_invalid"], lo, hi)
+        sum_x, _ = self._get_window_sums(prefix["sum_x"], lo, hi)
+        sum_y, sum_y_scale = self._get_window_sums(prefix["sum_y"], lo, hi)
+        sum_xy, _ = self._get_window_sums(prefix["sum_xy"], lo, hi)
+        sum_xx, _ = self._get_window_sums(prefix["sum_xx"], lo, hi)
+        if metric == "coef":
+            result = CoefficientAnalyser.get_coefficient_from_sums(
+                n, sum_x, sum_y, sum_xy, sum_xx
+            )
+        elif metric == "normalized_coef":
+            coefficient = CoefficientAnalyser.get_coefficient_from_sums(
+                n, sum_x, sum_y, sum_xy, sum_xx
+            )
+            mean = prefix["shift"][lo] + sum_y / n
+            with np.errstate(divide="ignore", invalid="ignore"):
+                result = coefficient / mean
+        else:
+            sum_yy, sum_yy_scale = self._get_window_sums(
+                prefix["sum_yy"], lo, hi
+            )
+            score = CoefficientAnalyser.get_coefficient_score_from_sums(
+                n, sum_x, sum_y, sum_xy, sum_xx, sum_yy
+            )
+            # A constant window leaves only the rounding of the prefix
+            # differences
+            s_yy = sum_yy - sum_y**2 / n
+            rounding = (
+                8
+                * np.finfo(float).eps
+                * (sum_yy_scale + 2 * np.abs(sum_y) / n * sum_y_scale)
+            )
+            result = np.where(s_yy <= rounding, np.nan, score)
+        return np.where(n_invalid > 0, np.nan, result)
+
+    def _get_variance_metric(
+        self, metric: str, lo: np.ndarray, hi: np.ndarray, ddof: int = 1
+    ) -> np.ndarray:
+        """
+        Get a normalized diff variance over row windows, skipping NaN.
+
+        Args:
+            metric (str): "oc_variance" or "hl_variance".
+            lo (np.ndarray): The first row of each window.
+            hi (np.ndarray): One past the last row of each window.
+            ddof (int, optional): The delta degrees of freedom. Defaults to 1.
+
+        Returns:
+            np.ndarray: The variance values.
+        """
+        prefix = self._get_prefix(metric)
+        n_invalid, _ = self._get_window_sums(prefix["n_invalid"], lo, hi)
+        count, _ = self._get_window_sums(prefix["count"], lo, hi)
+        sum_y, _ = self._get_window_sums(prefix["sum_y"], lo, hi)
+        sum_yy, _ = self._get_window_sums(prefix["sum_yy"], lo, hi)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            m2 = np.maximum(sum_yy - sum_y**2 / count, 0.0)
+            variance = np.where(
+                (count > ddof) & (n_invalid == 0),
+                m2 / (count - ddof),
+                np.nan,
+            )
+        return variance
+
+    def get_metrics(
+        self, lo: np.ndarray, hi: np.ndarray, metrics: List[Metric]
+    ) -> Dict[Metric, np.ndarray]:
+        """
+        Compute per-window metrics in O(1) per window, like
+        `get_segment_metrics` but without gathering the rows.
+
+        Args:
+            lo (np.ndarray): The first row of each non-empty window.
+            hi (np.ndarray): One past the last row of each window, in the same code.
+            metrics (List[Metric]): The (metric, arg) pairs, arg being None for the variances.
+
+        Returns:
+            Dict[Metric, np.ndarray]: The values of each metric per window.
+        """
+        results = {}
+        for metric, arg in metrics:
+            if metric == "profit":
+                results[(metric, arg)] = get_segment_metrics(
+                    {arg: self.layout.ohlcv[arg].to_numpy()},
+                    lo,
+                    hi,
+                    [(metric, arg)],
+                )[(metric, arg)]
+            elif metric in RANGE_METRICS:
+                results[(metric, arg)] = self._get_range_metric(
+                    metric, arg, lo, hi
+                )
+            elif metric in VARIANCE_METRICS:
+                results[(metric, arg)] = self._get_variance_metric(
+                    metric, lo, hi
+                )
+            elif metric in COEF_METRICS:
+                results[(metric, arg)] = self._get_coef_metric(
+                    metric, arg, lo, hi
+                )
+            else:
+                raise ValueError(f"Unknown metric: {metric}")
+        return results
@@ -0,0 +1,280 @@
+import functools
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, Iterator, List, NamedTuple, Tuple
+import pandas as pd
+
+# The stage returned when profiling is disabled, reusable as it does nothing
+NULL_STAGE = nullcontext()
+
+
+class StageRecord(NamedTuple):
+    """
+    The measurement of one run of a stage.
+
+    `stage` is the dotted path of the stage below the method call, "total"
+    for the call itself. `self_seconds` excludes the time of nested stages.
+    The byte counts are 0 unless the profiler tracks memory.
+    """
+
+    method: str
+    stage: str
+    seconds: float
+    self_seconds: float
+    allocated_bytes: int
+    peak_bytes: int
+
+
+class _Frame:
+    """
+    An open stage on the stack of a thread.
+    """
+
+    __slots__ = (
+        "method",
+        "stage",
+        "started",
+        "child_seconds",
+        "start_bytes",
+        "peak_bytes",
+    )
+
+    def __init__(self, method: str, stage: str) -> None:
+        self.method = method
+        self.stage = stage
+        self.child_seconds = 0.0
+        self.start_bytes = 0
+        self.peak_bytes = 0
+        self.started = 0.0
+
+
+class Profiler:
+    def __init__(
+        self, sinks: List[Callable] = None, track_memory: bool = False
+    ) -> None:
+        """
+        Time the stages of analyser calls and aggregate them per method.
+
+        Every finished stage is aggregated into `report` and passed as a
+        `StageRecord` to each sink, e.g. a logger or a metrics exporter.
+        With `track_memory`, the bytes allocated by each stage and its peak
+        are counted with `tracemalloc`, which slows the calls down. As
+        `tracemalloc` counts the allocations of every thread, the calls of
+        different threads are then measured one at a time: a call waits
+        until the calls measured in other threads have returned.
+
+        Args:
+            sinks (List[Callable], optional): The callables receiving each `StageRecord`. Defaults to None.
+            track_memory (bool, optional): Whether to count allocations. Defaults to False.
+        """
+        self.sinks = list(sinks or [])
+        self.track_memory = track_memory
+        self._stats: Dict[Tuple[str, str], List] = {}
+        self._lock = threading.Lock()
+        self._memory_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _get_frames(self) -> List[_Frame]:
+        """
+        Get the stack of open stages of the current thread.
+
+        Returns:
+            List[_Frame]: The open stages, innermost last.
+        """
+        frames = getattr(self._local, "frames", None)
+        if frames is None:
+            frames = self._local.frames = []
+        return frames
+
+    @contextmanager
+    def call(self, method: str) -> Iterator[None]:
+        """
+        Measure a method call as its "total" stage.
+
+        Args:
+            method (str): The method name.
+        """
+        with self._measure(_Frame(method, "total")):
+            yield
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Measure a stage of the innermost method call.
+
+        Args:
+            name (str): The stage name.
+        """
+        frames = self._get_frames()
+        if not frames:
+            frame = _Frame("", name)
+        elif frames[-1].stage == "total":
+            frame = _Frame(frames[-1].method, name)
+        else:
+            frame = _Frame(frames[-1].method, f"{frames[-1].stage}.{name}")
+        with self._measure(frame):
+            yield
+
+    @contextmanager
+    def _measure(self, frame: _Frame) -> Iterator[None]:
+        """
+        Time a stage, count its allocations and record it on exit.
+
+        The outermost stage of a thread holds the memory lock when memory is
+        tracked, so that no other thread starts, stops or resets the
+        process-wide tracing while its stages are open.
+
+        Args:
+            frame (_Frame): The stage.
+        """
+        if self.track_memory and not self._get_frames():
+            with self._memory_lock:
+                with self._measure_frame(frame):
+                    yield
+        else:
+            with self._measure_frame(frame):
+                yield
+
+    @contextmanager
+    def _measure_frame(self, frame: _Frame) -> Iterator[None]:
+        """
+        Time a stage, count its allocations and record it on exit.
+
+        Args:
+            frame (_Frame): The stage.
+        """
+        frames = self._get_frames()
+        started_tracing = False
+        if self.track_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+            if frames:
+                frames[-1].peak_bytes = max(frames[-1].peak_bytes, peak_bytes)
+            tracemalloc.reset_peak()
+            frame.start_bytes = frame.peak_bytes = current_bytes
+        frames.append(frame)
+        frame.started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - frame.started
+            frames.pop()
+            allocated_bytes = peak_bytes = 0
+            if self.track_memory:
+                current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+                peak_bytes = max(frame.peak_bytes, peak_bytes)
+                allocated_bytes = current_bytes - frame.start_bytes
+                if frames:
+                    frames[-1].peak_bytes = max(
+                        frames[-1].peak_bytes, peak_bytes
+                    )
+                peak_bytes -= frame.start_bytes
+                if started_tracing:
+                    tracemalloc.stop()
+            if frames:
+                frames[-1].child_seconds += seconds
+            self._record(
+                StageRecord(
+                    frame.method,
+                    frame.stage,
+                    seconds,
+                    seconds - frame.child_seconds,
+                    allocated_bytes,
+                    peak_bytes,
+                )
+            )
+
+    def _record(self, record: StageRecord) -> None:
+        """
+        Aggregate a stage record and pass it to the sinks.
+
+        Args:
+            record (StageRecord): The stage record.
+        """
+        with self._lock:
+            stats = self._stats.get((record.method, record.stage))
+            if stats is None:
+                self._stats[(record.method, record.stage)] = [
+                    1,
+                    record.seconds,
+                    record.self_seconds,
+                    record.seconds,
+                    record.allocated_bytes,
+                    record.peak_bytes,
+                ]
+            else:
+                stats[0] += 1
+                stats[1] += record.seconds
+                stats[2] += record.self_seconds
+                stats[3] = max(stats[3], record.seconds)
+                stats[4] += record.allocated_bytes
+                stats[5] = max(stats[5], record.peak_bytes)
+        for sink in self.sinks:
+            sink(record)
+
+    def report(self) -> pd.DataFrame:
+        """
+        Get the aggregated statistics of every stage of every method.
+
+        The self time of a method's "total" stage is the time outside its
+        named stages, i.e. mostly the assembly of the result.
+
+        Returns:
+            pd.DataFrame: The calls, total, mean, max and self seconds, allocated bytes and peak bytes indexed by (method, stage).
+        """
+        with self._lock:
+            stats = {key: list(values) for key, values in self._stats.items()}
+        report_df = pd.DataFrame.from_dict(
+            stats,
+            orient="index",
+            columns=[
+                "calls",
+                "total_s",
+                "self_s",
+                "max_s",
+                "allocated_bytes",
+                "peak_bytes",
+            ],
+        )
+        report_df.index = pd.MultiIndex.from_arrays(
+            [[method for method, _ in stats], [stage for _, stage in stats]],
+            names=["method", "stage"],
+        )
+        report_df.insert(
+            2, "mean_s", report_df["total_s"] / report_df["calls"]
+        )
+        return report_df.sort_index()
+
+    def reset(self) -> None:
+        """
+        Drop the aggregated statistics.
+        """
+        with self._lock:
+            self._stats.clear()
+
+
+def profiled(method: Callable) -> Callable:
+    """
+    Decorate an analyser method so that its calls are measured by the
+    analyser's `profiler` when it has one.
+
+    Args:
+        method (Callable): The analyser method.
+
+    Returns:
+        Callable: The profiled method.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        profiler = self.profiler
+        if profiler is None:
+            return method(self, *args, **kwargs)
+        with profiler.call(method.__name__):
+            return method(self, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,102 @@
+from typing import Dict
+import numpy as np
+import pandas as pd
+
+# Column -> reduction of the bars of a period
+AGGREGATIONS = {
+    "open": "first",
+    "high": "max",
+    "low": "min",
+    "close": "last",
+    "volume": "sum",
+}
+
+# Resolution of the pyramid -> the finer resolution it is resampled from,
+# whose periods nest into its own
+PYRAMID_RULES = {"D": None, "W": "D", "M": "D", "Q": "M"}
+
+
+def resample_ohlcv(ohlcv: pd.DataFrame, rule: str) -> pd.DataFrame:
+    """
+    Resample the bars of every code at once with segmented reductions.
+
+    The rows are sorted by (code, period), so the bars of each code and
+    period are a contiguous segment reduced with `reduceat`: first open,
+    highest high, lowest low, last close and summed volume. Each bar is
+    labelled with the last day of its period, as `DataFrame.resample` does,
+    and periods without bars are skipped.
+
+    Args:
+        ohlcv (pd.DataFrame): The ohlcv data indexed by date, with an optional "code" column.
+        rule (str): The pandas period alias, e.g. "D", "W", "M" or "Q".
+
+    Returns:
+        pd.DataFrame: The resampled ohlcv data sorted by (code, date).
+    """
+    periods = ohlcv.index.to_period(rule)
+    if "code" in ohlcv:
+        code_ids, codes = pd.factorize(ohlcv["code"], sort=True)
+    else:
+        code_ids, codes = np.zeros(len(ohlcv), dtype=np.int64), None
+    order = np.lexsort((ohlcv.index.asi8, code_ids))
+    code_ids = code_ids[order]
+    period_ordinals = periods.asi8[order]
+    is_start = np.ones(len(order), dtype=bool)
+    is_start[1:] = (np.diff(code_ids) != 0) | (np.diff(period_ordinals) != 0)
+    starts = np.flatnonzero(is_start)
+    ends = np.append(starts[1:], len(order)) - 1
+
+    columns = {}
+    for column, aggregation in AGGREGATIONS.items():
+        if column not in ohlcv:
+            continue
+        values = ohlcv[column].to_numpy()[order]
+        if aggregation == "first":
+            columns[column] = values[starts]
+        elif aggregation == "last":
+            columns[column] = values[ends]
+        elif aggregation == "max":
+            columns[column] = np.fmax.reduceat(values, starts)
+        elif aggregation == "min":
+            columns[column] = np.fmin.reduceat(values, starts)
+        else:
+            columns[column] = np.add.reduceat(values, starts)
+    if codes is not None:
+        columns["code"] = np.asarray(codes)[code_ids[starts]]
+    dates = periods[order[starts]].end_time.normalize()
+    return pd.DataFrame(columns, index=dates.rename(ohlcv.index.name))
+
+
+class ResamplePyramid:
+    def __init__(self, ohlcv: pd.DataFrame) -> None:
+        """
+        A cache of the data resampled at several resolutions.
+
+        Each resolution of `PYRAMID_RULES` is built on first use from the
+        finer resolution its periods nest into, e.g. quarters from months,
+        so every level but the daily one reduces already reduced bars.
+        Other rules are resampled from the original bars.
+
+        Args:
+            ohlcv (pd.DataFrame): The ohlcv data indexed by date, with an optional "code" column.
+        """
+        self.ohlcv = ohlcv
+        self._levels: Dict[str, pd.DataFrame] = {}
+
+    def get(self, rule: str) -> pd.DataFrame:
+        """
+        Get the data resampled at a resolution, resampling it on first use.
+
+        Args:
+            rule (str): The pandas period alias, e.g. "D", "W", "M" or "Q".
+
+        Returns:
+            pd.DataFrame: The resampled ohlcv data sorted by (code, date).
+        """
+        if rule not in self._levels:
+            source_rule = PYRAMID_RULES.get(rule)
+            source = (
+                self.ohlcv if source_rule is None else self.get(source_rule)
+            )
+            self._levels[rule] = resample_ohlcv(source, rule)
+        return self._levels[rule]
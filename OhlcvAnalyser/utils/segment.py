@@ -0,0 +1,92 @@
+from typing import Tuple
+import numpy as np
+import pandas as pd
+
+
+def get_segment_rows(
+    lo: np.ndarray, hi: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Expand [lo, hi) row bounds into the covered row numbers.
+
+    Gathering a column with the returned rows lays the segments out back to
+    back, which is the input the other segment functions expect.
+
+    Args:
+        lo (np.ndarray): The first row of each segment.
+        hi (np.ndarray): One past the last row of each segment.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The row numbers and the segment id of each row.
+    """
+    counts = hi - lo
+    ids = np.repeat(np.arange(len(counts)), counts)
+    starts = np.cumsum(counts) - counts
+    rows = np.arange(counts.sum()) - starts[ids] + lo[ids]
+    return rows, ids
+
+
+def get_segment_regression_sums(
+    values: np.ndarray, ids: np.ndarray, counts: np.ndarray
+) -> pd.DataFrame:
+    """
+    Get the regression sums of every segment, regressing on positions 1..n.
+
+    Args:
+        values (np.ndarray): The gathered values of all segments.
+        ids (np.ndarray): The segment id of each value.
+        counts (np.ndarray): The number of values in each segment.
+
+    Returns:
+        pd.DataFrame: The n, sum_x, sum_y, sum_xy, sum_xx and sum_yy columns per segment.
+    """
+    n = np.asarray(counts, dtype=float)
+    starts = np.cumsum(counts) - counts
+    x = (np.arange(len(ids)) - starts[ids] + 1).astype(float)
+    y = np.asarray(values, dtype=float)
+    sums_df = pd.DataFrame(
+        {
+            "n": n,
+            "sum_x": n * (n + 1) / 2,
+            "sum_y": np.bincount(ids, weights=y, minlength=len(n)),
+            "sum_xy": np.bincount(ids, weights=x * y, minlength=len(n)),
+            "sum_xx": n * (n + 1) * (2 * n + 1) / 6,
+            "sum_yy": np.bincount(ids, weights=y * y, minlength=len(n)),
+        }
+    )
+    return sums_df
+
+
+def get_segment_moments(
+    values: np.ndarray, ids: np.ndarray, counts: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Get the count, mean and sum of squared deviations of every segment,
+    skipping NaN.
+
+    Args:
+        values (np.ndarray): The gathered values of all segments.
+        ids (np.ndarray): The segment id of each value.
+        counts (np.ndarray): The number of values in each segment.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: The count, mean and m2 of each segment.
+    """
+    v = np.asarray(values, dtype=float)
+    valid = ~np.isnan(v)
+    n_segments = len(counts)
+    count = np.bincount(ids, weights=valid, minlength=n_segments)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = (
+            np.bincount(
+                ids, weights=np.where(valid, v, 0), minlength=n_segments
+            )
+            / count
+        )
+    m2 = np.bincount(
+        ids,
+        weights=np.where(valid, (v - mean[ids]) ** 2, 0),
+        minlength=n_segments,
+    )
+    return count, mean, m2
+
@@ -0,0 +1,120 @@
+import numpy as np
+
+
+class SparseTable:
+    def __init__(self, values: np.ndarray, max_length: int = None) -> None:
+        """
+        Precompute the min, the max and the drawdown ratio of every block of
+        2^k consecutive values, so that any [lo, hi) range is answered from
+        two overlapping blocks in O(1).
+
+        The drawdown ratio of a range is the minimum of values[j] / values[i]
+        over i <= j, that is one plus its maximum drawdown. NaN values are
+        skipped.
+
+        The table holds one level per power of two up to `max_length`, so
+        values whose ranges never cross a code boundary only need the levels
+        of the longest code instead of the levels of all rows.
+
+        Args:
+            values (np.ndarray): The values, e.g. the sorted closes of every code.
+            max_length (int, optional): The length of the longest range queried. Defaults to None for len(values).
+        """
+        values = np.asarray(values, dtype=float)
+        if max_length is None or max_length > len(values):
+            max_length = len(values)
+        n_levels = max(max_length, 1).bit_length()
+        self._min = np.full((n_levels, len(values)), np.nan)
+        self._max = np.full((n_levels, len(values)), np.nan)
+        self._ratio = np.full((n_levels, len(values)), np.nan)
+        self._min[0] = values
+        self._max[0] = values
+        self._ratio[0] = np.where(np.isnan(values), np.nan, 1.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for k in range(1, n_levels):
+                half = 1 << (k - 1)
+                size = len(values) - (1 << k) + 1
+                left = slice(0, size)
+                right = slice(half, half + size)
+                self._min[k, :size] = np.fmin(
+                    self._min[k - 1, left], self._min[k - 1, right]
+                )
+                self._max[k, :size] = np.fmax(
+                    self._max[k - 1, left], self._max[k - 1, right]
+                )
+                # A drawdown lies within a half or falls from the left half
+                # into the right one
+                self._ratio[k, :size] = np.fmin(
+                    np.fmin(
+                        self._ratio[k - 1, left], self._ratio[k - 1, right]
+                    ),
+                    self._min[k - 1, right] / self._max[k - 1, left],
+                )
+
+    @staticmethod
+    def _get_levels(lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+        """
+        Get the level of the largest block that fits in each range.
+
+        Args:
+            lo (np.ndarray): The first index of each non-empty range.
+            hi (np.ndarray): One past the last index of each range.
+
+        Returns:
+            np.ndarray: The level k, floor(log2(hi - lo)), of each range.
+        """
+        _, exponent = np.frexp(np.asarray(hi) - np.asarray(lo))
+        return exponent - 1
+
+    def get_min(self, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+        """
+        Get the minimum of each non-empty [lo, hi) range.
+
+        Args:
+            lo (np.ndarray): The first index of each range.
+            hi (np.ndarray): One past the last index of each range.
+
+        Returns:
+            np.ndarray: The minimum of each range.
+        """
+        k = self._get_levels(lo, hi)
+        return np.fmin(self._min[k, lo], self._min[k, hi - (1 << k)])
+
+    def get_max(self, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+        """
+        Get the maximum of each non-empty [lo, hi) range.
+
+        Args:
+            lo (np.ndarray): The first index of each range.
+            hi (np.ndarray): One past the last index of each range.
+
+        Returns:
+            np.ndarray: The maximum of each range.
+        """
+        k = self._get_levels(lo, hi)
+        return np.fmax(self._max[k, lo], self._max[k, hi - (1 << k)])
+
+    def get_min_ratio(self, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+        """
+        Get the drawdown ratio, min(values[j] / values[i]) over
+        lo <= i <= j < hi, of each non-empty [lo, hi) range.
+
+        Args:
+            lo (np.ndarray): The first index of each range.
+            hi (np.ndarray): One past the last index of each range.
+
+        Returns:
+            np.ndarray: The drawdown ratio of each range.
+        """
+        lo = np.asarray(lo)
+        hi = np.asarray(hi)
+        k = self._get_levels(lo, hi)
+        size = 1 << k
+        ratio = np.fmin(self._ratio[k, lo], self._ratio[k, hi - size])
+        # The pairs the two blocks miss fall from the first block into the
+        # rows after it
+        has_rest = hi - lo > size
+        rest_lo = np.where(has_rest, lo + size, lo)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fall = self.get_min(rest_lo, hi) / self._max[k, lo]
+        return np.fmin(ratio, np.where(has_rest, fall, np.nan))
@@ -0,0 +1,5 @@
+from .backends import check_backends, make_edge_case_ohlcv
+from .imports import check_imports, measure_import
+from .market import make_multi_ohlcv, make_single_ohlcv
+from .runner import compare_results, measure, run_benchmarks
+from .suite import BENCHMARKS, MarketData, benchmark
@@ -0,0 +1,107 @@
+import argparse
+import sys
+
+import pandas as pd
+
+from .backends import check_backends
+from .imports import check_imports
+from .runner import (
+    compare_results,
+    read_results,
+    run_benchmarks,
+    write_results,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark the analysers on synthetic OHLCV markets.",
+    )
+    parser.add_argument(
+        "--codes", type=int, nargs="+", default=[100], help="numbers of codes"
+    )
+    parser.add_argument(
+        "--bars",
+        type=int,
+        nargs="+",
+        default=[500],
+        help="numbers of bars per code",
+    )
+    parser.add_argument(
+        "--missing", type=float, default=0.0, help="missing-bar rate"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="timed runs per benchmark"
+    )
+    parser.add_argument(
+        "--filter",
+        nargs="+",
+        default=None,
+        help="shell-style patterns of the benchmark names, e.g. 'multi.*'",
+    )
+    parser.add_argument("--output", help="JSON file to write the results to")
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("BASE", "HEAD"),
+        help="compare two JSON result files instead of running",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.1,
+        help="time ratio above which a comparison is flagged",
+    )
+    parser.add_argument(
+        "--imports",
+        action="store_true",
+        help="check the import times against their budgets instead of running",
+    )
+    parser.add_argument(
+        "--backends",
+        action="store_true",
+        help="check every backend against the numpy backend instead of running",
+    )
+    args = parser.parse_args()
+
+    if args.backends:
+        records = check_backends(seed=args.seed)
+        if args.output:
+            write_results({"backends": records}, args.output)
+        if not all(record["passed"] for record in records):
+            sys.exit(1)
+        return
+
+    if args.imports:
+        records = check_imports(args.repeat)
+        if args.output:
+            write_results({"imports": records}, args.output)
+        if not all(record["passed"] for record in records):
+            sys.exit(1)
+        return
+
+    if args.compare:
+        comparison_df = compare_results(
+            read_results(args.compare[0]), read_results(args.compare[1])
+        )
+        comparison_df["regression"] = (
+            comparison_df["time_ratio"] > args.threshold
+        )
+        with pd.option_context("display.max_rows", None, "display.width", 200):
+            print(comparison_df)
+        return
+
+    sizes = [
+        (n_codes, n_bars) for n_codes in args.codes for n_bars in args.bars
+    ]
+    results = run_benchmarks(
+        sizes, args.missing, args.seed, args.repeat, args.filter
+    )
+    if args.output:
+        write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
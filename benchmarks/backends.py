@@ -0,0 +1,284 @@
+from typing import Any, Callable, Dict, List, Tuple
+import numpy as np
+import pandas as pd
+
+from OhlcvAnalyser import MultiOhlcvAnalyser
+from OhlcvAnalyser.backend import get_available_backends, get_backend
+from OhlcvAnalyser.utils import CodeLayout
+
+from .market import make_multi_ohlcv
+
+REFERENCE_BACKEND = "numpy"
+
+# Kernel name -> call of the kernel on the bound backend and the columns
+KERNELS: Dict[str, Callable[[Any, Dict[str, np.ndarray]], Any]] = {
+    "regression_sums": lambda kernels, columns: kernels.regression_sums(
+        columns["close"]
+    ),
+    "normalized_diff_moments": (
+        lambda kernels, columns: kernels.normalized_diff_moments(
+            columns["open"], columns["close"]
+        )
+    ),
+    "range_min": lambda kernels, columns: kernels.range_min(columns["close"]),
+    "range_max": lambda kernels, columns: kernels.range_max(columns["close"]),
+    "min_ratio": lambda kernels, columns: kernels.min_ratio(columns["close"]),
+}
+
+# Analyser method -> positional arguments
+ANALYSER_CALLS = {
+    "coef": ("close",),
+    "normalized_coef": ("close",),
+    "coef_score": ("close",),
+    "oc_variance": (),
+    "hl_variance": (),
+    "max_drawdown": (),
+    "profit": (),
+    "info": (),
+    "summary": (),
+}
+
+# The number of batches the last rows are appended in by the append checks
+N_APPENDS = 3
+
+
+def make_edge_case_ohlcv(
+    n_codes: int = 50, n_bars: int = 200, seed: int = 0
+) -> pd.DataFrame:
+    """
+    Generate a synthetic market with the inputs the kernels must agree on:
+    missing bars, NaN prices, zero prices such as halted trading days, a
+    code with a single bar and a code whose closes are all NaN.
+
+    Args:
+        n_codes (int, optional): The number of codes. Defaults to 50.
+        n_bars (int, optional): The number of bars per code before dropping. Defaults to 200.
+        seed (int, optional): The random seed. Defaults to 0.
+
+    Returns:
+        pd.DataFrame: The multi-ohlcv data indexed by date.
+    """
+    rng = np.random.default_rng(seed)
+    multi_ohlcv = make_multi_ohlcv(n_codes, n_bars, 0.05, seed)
+    codes = multi_ohlcv["code"].unique()
+    for column, value, rate in [
+        ("open", np.nan, 0.02),
+        ("close", np.nan, 0.02),
+        ("open", 0.0, 0.01),
+        ("close", 0.0, 0.01),
+    ]:
+        hit = rng.random(len(multi_ohlcv)) < rate
+        multi_ohlcv.loc[hit, column] = value
+    code = multi_ohlcv["code"].to_numpy()
+    first_rows = multi_ohlcv.groupby("code").cumcount().to_numpy() == 0
+    multi_ohlcv.loc[first_rows & (code == codes[0]), "open"] = 0.0
+    multi_ohlcv.loc[code == codes[2], "close"] = np.nan
+    multi_ohlcv = multi_ohlcv[(code != codes[1]) | first_rows]
+    return multi_ohlcv
+
+
+def _get_segments(
+    layout: CodeLayout, seed: int
+) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Get the segments the kernels are compared on: every code, and a random
+    non-empty sub-range of every code.
+
+    Args:
+        layout (CodeLayout): The code layout of the data.
+        seed (int): The random seed.
+
+    Returns:
+        Dict[str, Tuple[np.ndarray, np.ndarray]]: The lo, hi row bounds of each segment set.
+    """
+    rng = np.random.default_rng(seed)
+    lo, hi = layout.offsets[:-1], layout.offsets[1:]
+    sub_lo = lo + (rng.random(len(lo)) * (hi - lo)).astype(np.int64)
+    sub_hi = (
+        sub_lo + 1 + (rng.random(len(lo)) * (hi - sub_lo)).astype(np.int64)
+    )
+    return {"codes": (lo, hi), "ranges": (sub_lo, np.minimum(sub_hi, hi))}
+
+
+def _make_appended_analyser(
+    multi_ohlcv: pd.DataFrame, backend: str
+) -> MultiOhlcvAnalyser:
+    """
+    Create an analyser of the first half of the dates and append the other
+    half in batches, so that full-range queries are answered from the
+    accumulators that `append` updates.
+
+    Args:
+        multi_ohlcv (pd.DataFrame): The multi-ohlcv data indexed by date.
+        backend (str): The backend name.
+
+    Returns:
+        MultiOhlcvAnalyser: The analyser of all the data.
+    """
+    dates = np.sort(multi_ohlcv.index.unique())
+    cuts = dates[
+        np.linspace(len(dates) // 2, len(dates), N_APPENDS + 1)[:-1].astype(
+            int
+        )
+    ]
+    batches = np.searchsorted(cuts, multi_ohlcv.index, side="right")
+    analyser = MultiOhlcvAnalyser(multi_ohlcv[batches == 0], backend=backend)
+    for batch in range(1, N_APPENDS + 1):
+        analyser.append(multi_ohlcv[batches == batch])
+    return analyser
+
+
+def _is_close(expected: Any, actual: Any, rtol: float) -> bool:
+    """
+    Check that two kernel or analyser results are equal within a relative
+    tolerance, NaN matching NaN and inf matching inf of the same sign.
+    Codes and dates must be equal.
+
+    Args:
+        expected (Any): The reference result.
+        actual (Any): The compared result.
+        rtol (float): The relative tolerance.
+
+    Returns:
+        bool: Whether the results match.
+    """
+    if isinstance(expected, pd.DataFrame):
+        return expected.columns.equals(actual.columns) and all(
+            _is_close(expected[column], actual[column], rtol)
+            for column in expected.columns
+        )
+    if isinstance(expected, pd.Series):
+        if not expected.index.equals(actual.index):
+            return False
+        expected, actual = expected.to_numpy(), actual.to_numpy()
+        if expected.dtype == object:
+            # Mixed values such as the codes, dates and numbers of `info`
+            expected, actual = tuple(expected), tuple(actual)
+    if isinstance(expected, tuple):
+        return len(expected) == len(actual) and all(
+            _is_close(left, right, rtol)
+            for left, right in zip(expected, actual)
+        )
+    if isinstance(expected, (str, pd.Timestamp)):
+        return expected == actual
+    expected = np.asarray(expected, dtype=float)
+    actual = np.asarray(actual, dtype=float)
+    return expected.shape == actual.shape and bool(
+        np.allclose(expected, actual, rtol=rtol, atol=0, equal_nan=True)
+    )
+
+
+def check_backends(
+    n_codes: int = 50,
+    n_bars: int = 200,
+    seed: int = 0,
+    rtol: float = 1e-9,
+    verbose: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    Check that every available backend matches the numpy backend, kernel by
+    kernel and through the analyser, on the edge cases of
+    `make_edge_case_ohlcv`. The results of the prefix-sum index, and the
+    full-range results of an analyser whose bars were appended, which come
+    from its accumulators, are checked against the segment path on every
+    backend, the numpy one included.
+
+    Args:
+        n_codes (int, optional): The number of codes. Defaults to 50.
+        n_bars (int, optional): The number of bars per code before dropping. Defaults to 200.
+        seed (int, optional): The random seed. Defaults to 0.
+        rtol (float, optional): The relative tolerance of the comparisons. Defaults to 1e-9.
+        verbose (bool, optional): Whether to print each result. Defaults to True.
+
+    Returns:
+        List[Dict[str, Any]]: A record per backend and check, with whether it passed and the error it raised.
+    """
+    multi_ohlcv = make_edge_case_ohlcv(n_codes, n_bars, seed)
+    layout = CodeLayout(multi_ohlcv)
+    columns = {
+        column: layout.ohlcv[column].to_numpy() for column in ["open", "close"]
+    }
+    segments = _get_segments(layout, seed)
+
+    checks = {}
+    # Check name -> name of the check whose numpy result is expected
+    references = {}
+    for segment_name, (lo, hi) in segments.items():
+        for kernel_name, kernel in KERNELS.items():
+            checks[f"kernel.{kernel_name}[{segment_name}]"] = (
+                lambda backend, lo=lo, hi=hi, kernel=kernel: kernel(
+                    get_backend(backend)(lo, hi), columns
+                )
+            )
+    dates = np.sort(multi_ohlcv.index.unique())
+    window = {
+        "start": dates[len(dates) // 3],
+        "end": dates[2 * len(dates) // 3],
+    }
+    for method, args in ANALYSER_CALLS.items():
+        checks[f"multi.{method}"] = (
+            lambda backend, method=method, args=args: getattr(
+                MultiOhlcvAnalyser(multi_ohlcv, backend=backend), method
+            )(*args)
+        )
+        checks[f"multi.{method}[range]"] = (
+            lambda backend, method=method, args=args: getattr(
+                MultiOhlcvAnalyser(multi_ohlcv, backend=backend), method
+            )(*args, **window)
+        )
+        checks[f"multi.{method}[append]"] = (
+            lambda backend, method=method, args=args: getattr(
+                _make_appended_analyser(multi_ohlcv, backend), method
+            )(*args)
+        )
+        references[f"multi.{method}[append]"] = f"multi.{method}"
+        checks[f"multi.{method}[prefix]"] = (
+            lambda backend, method=method, args=args: getattr(
+                MultiOhlcvAnalyser(
+                    multi_ohlcv, prefix_index=True, backend=backend
+                ),
+                method,
+            )(*args)
+        )
+        references[f"multi.{method}[prefix]"] = f"multi.{method}"
+        checks[f"multi.{method}[prefix range]"] = (
+            lambda backend, method=method, args=args: getattr(
+                MultiOhlcvAnalyser(
+                    multi_ohlcv, prefix_index=True, backend=backend
+                ),
+                method,
+            )(*args, **window)
+        )
+        references[f"multi.{method}[prefix range]"] = f"multi.{method}[range]"
+
+    records = []
+    with np.errstate(divide="ignore", invalid="ignore"):
+        expected = {
+            name: check(REFERENCE_BACKEND)
+            for name, check in checks.items()
+            if name not in references
+        }
+        for backend in get_available_backends():
+            for name, check in checks.items():
+                if backend == REFERENCE_BACKEND and name not in references:
+                    continue
+                record = {"backend": backend, "check": name, "error": None}
+                try:
+                    record["passed"] = _is_close(
+                        expected[references.get(name, name)],
+                        check(backend),
+                        rtol,
+                    )
+                except Exception as error:
+                    record["passed"] = False
+                    record["error"] = f"{type(error).__name__}: {error}"
+                records.append(record)
+                if verbose:
+                    print(
+                        f"{backend:<8} {name:<45} "
+                        f"{'ok' if record['passed'] else 'FAILED'}"
+                        f"{' ' + record['error'] if record['error'] else ''}"
+                    )
+    if verbose and get_available_backends() == [REFERENCE_BACKEND]:
+        print(f"No backend other than {REFERENCE_BACKEND} is available")
+    return records
@@ -0,0 +1,115 @@
+import json
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+# Modules that importing the package must not load, as they dominate the
+# cold start of short-lived workers
+HEAVY_MODULES = [
+    "sklearn",
+    "scipy",
+    "matplotlib",
+    "seaborn",
+    "numba",
+    "asyncio",
+]
+
+# Import statement -> budget in seconds, on top of importing numpy and pandas
+IMPORT_BUDGETS = {
+    "import OhlcvAnalyser": 0.1,
+    "from OhlcvAnalyser import MultiOhlcvAnalyser, SingleOhlcvAnalyser": 0.1,
+    "from OhlcvAnalyser.analyser import CoefficientAnalyser": 0.1,
+    "from OhlcvAnalyser.plotter import Plotter": 0.1,
+    "from OhlcvAnalyser import AsyncMultiOhlcvAnalyser": 0.15,
+}
+
+# Import statement -> heavy modules it is expected to load
+ALLOWED_MODULES = {
+    "from OhlcvAnalyser import AsyncMultiOhlcvAnalyser": ["asyncio"],
+}
+
+_PROBE = """
+import json, sys, time
+import numpy, pandas
+started = time.perf_counter()
+exec(sys.argv[1])
+seconds = time.perf_counter() - started
+heavy_modules = [name for name in json.loads(sys.argv[2]) if name in sys.modules]
+print(json.dumps({"seconds": seconds, "heavy_modules": heavy_modules}))
+"""
+
+
+def measure_import(statement: str, repeat: int = 5) -> Dict[str, Any]:
+    """
+    Measure the import time of a statement in fresh interpreters.
+
+    numpy and pandas are imported before the timing, so only the cost of
+    the package itself is measured.
+
+    Args:
+        statement (str): The import statement.
+        repeat (int, optional): The number of fresh interpreters. Defaults to 5.
+
+    Returns:
+        Dict[str, Any]: The min and median seconds and the heavy modules the statement loaded.
+    """
+    probes = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                _PROBE,
+                statement,
+                json.dumps(HEAVY_MODULES),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        probes.append(json.loads(output))
+    seconds = sorted(probe["seconds"] for probe in probes)
+    return {
+        "min_s": seconds[0],
+        "median_s": seconds[len(seconds) // 2],
+        "heavy_modules": probes[0]["heavy_modules"],
+    }
+
+
+def check_imports(
+    repeat: int = 5, verbose: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Check every import statement against its budget and the heavy modules.
+
+    Args:
+        repeat (int, optional): The number of fresh interpreters per statement. Defaults to 5.
+        verbose (bool, optional): Whether to print each result. Defaults to True.
+
+    Returns:
+        List[Dict[str, Any]]: A record per statement, with whether it passed.
+    """
+    records = []
+    for statement, budget_s in IMPORT_BUDGETS.items():
+        record = {
+            "statement": statement,
+            "budget_s": budget_s,
+            **measure_import(statement, repeat),
+        }
+        record["heavy_modules"] = [
+            name
+            for name in record["heavy_modules"]
+            if name not in ALLOWED_MODULES.get(statement, [])
+        ]
+        record["passed"] = (
+            record["median_s"] <= budget_s and not record["heavy_modules"]
+        )
+        records.append(record)
+        if verbose:
+            print(
+                f"{statement:<70} median={record['median_s'] * 1e3:8.2f} ms "
+                f"budget={budget_s * 1e3:6.0f} ms "
+                f"heavy={','.join(record['heavy_modules']) or '-'} "
+                f"{'ok' if record['passed'] else 'FAILED'}"
+            )
+    return records
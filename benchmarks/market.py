@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+
+def make_multi_ohlcv(
+    n_codes: int = 100,
+    n_bars: int = 500,
+    missing_rate: float = 0.0,
+    seed: int = 0,
+    start: str = "2015-01-01",
+) -> pd.DataFrame:
+    """
+    Generate a deterministic synthetic market of multi-ohlcv data.
+
+    The close of every code follows a geometric random walk on business
+    days; open, high and low scatter around it and the volume is an integer
+    count. Each bar is then dropped independently with probability
+    `missing_rate`, to mimic suspended or missing trading days.
+
+    Args:
+        n_codes (int, optional): The number of codes. Defaults to 100.
+        n_bars (int, optional): The number of bars per code before dropping. Defaults to 500.
+        missing_rate (float, optional): The probability of dropping each bar. Defaults to 0.0.
+        seed (int, optional): The random seed. Defaults to 0.
+        start (str, optional): The first date. Defaults to "2015-01-01".
+
+    Returns:
+        pd.DataFrame: The multi-ohlcv data indexed by date and sorted by (date, code).
+    """
+    rng = np.random.default_rng(seed)
+    shape = (n_codes, n_bars)
+    base_price = rng.uniform(1_000, 100_000, (n_codes, 1))
+    close = base_price * np.exp(
+        np.cumsum(rng.normal(0.0002, 0.02, shape), axis=1)
+    )
+    open_ = close * (1 + rng.normal(0, 0.01, shape))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.01, shape)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.01, shape)))
+    volume = rng.integers(10_000, 10_000_000, shape)
+
+    dates = pd.bdate_range(start, periods=n_bars, name="date")
+    codes = np.array([f"{code:06d}" for code in range(n_codes)])
+    multi_ohlcv = pd.DataFrame(
+        {
+            "open": open_.ravel(),
+            "high": high.ravel(),
+            "low": low.ravel(),
+            "close": close.ravel(),
+            "volume": volume.ravel(),
+            "code": np.repeat(codes, n_bars),
+        },
+        index=np.tile(dates, n_codes),
+    )
+    multi_ohlcv.index.name = "date"
+    if missing_rate > 0:
+        multi_ohlcv = multi_ohlcv[rng.random(n_codes * n_bars) >= missing_rate]
+    return multi_ohlcv.sort_index(kind="stable")
+
+
+def make_single_ohlcv(
+    n_bars: int = 500,
+    missing_rate: float = 0.0,
+    seed: int = 0,
+    start: str = "2015-01-01",
+) -> pd.DataFrame:
+    """
+    Generate deterministic synthetic ohlcv data of a single code.
+
+    Args:
+        n_bars (int, optional): The number of bars before dropping. Defaults to 500.
+        missing_rate (float, optional): The probability of dropping each bar. Defaults to 0.0.
+        seed (int, optional): The random seed. Defaults to 0.
+        start (str, optional): The first date. Defaults to "2015-01-01".
+
+    Returns:
+        pd.DataFrame: The ohlcv data indexed by date.
+    """
+    return make_multi_ohlcv(1, n_bars, missing_rate, seed, start)
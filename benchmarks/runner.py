@@ -0,0 +1,176 @@
+import fnmatch
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Tuple
+import numpy as np
+import pandas as pd
+
+from .suite import BENCHMARKS, MarketData
+
+
+def measure(
+    setup: Callable[[MarketData], Callable[[], Any]],
+    data: MarketData,
+    repeat: int = 5,
+) -> Dict[str, float]:
+    """
+    Time a benchmark and measure its peak allocation.
+
+    Every run gets a fresh setup, so it starts from cold state, and only
+    the returned call is timed. The allocations are traced in one extra run,
+    since tracing slows the timed runs down.
+
+    Args:
+        setup (Callable[[MarketData], Callable[[], Any]]): The benchmark setup.
+        data (MarketData): The synthetic data.
+        repeat (int, optional): The number of timed runs. Defaults to 5.
+
+    Returns:
+        Dict[str, float]: The min, median and mean seconds and the peak allocated bytes.
+    """
+    seconds = []
+    for _ in range(repeat):
+        run = setup(data)
+        gc.collect()
+        started = time.perf_counter()
+        run()
+        seconds.append(time.perf_counter() - started)
+
+    run = setup(data)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "min_s": min(seconds),
+        "median_s": float(np.median(seconds)),
+        "mean_s": float(np.mean(seconds)),
+        "peak_bytes": peak_bytes,
+    }
+
+
+def get_metadata() -> Dict[str, str]:
+    """
+    Get the environment the benchmarks run in.
+
+    Returns:
+        Dict[str, str]: The timestamp, Python, platform and library versions.
+    """
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+    }
+
+
+def run_benchmarks(
+    sizes: List[Tuple[int, int]],
+    missing_rate: float = 0.0,
+    seed: int = 0,
+    repeat: int = 5,
+    patterns: List[str] = None,
+    verbose: bool = True,
+) -> Dict[str, Any]:
+    """
+    Run the benchmarks on synthetic markets of several sizes.
+
+    Args:
+        sizes (List[Tuple[int, int]]): The (n_codes, n_bars) of each market.
+        missing_rate (float, optional): The probability of dropping each bar. Defaults to 0.0.
+        seed (int, optional): The random seed. Defaults to 0.
+        repeat (int, optional): The number of timed runs. Defaults to 5.
+        patterns (List[str], optional): The shell-style patterns of the benchmark names to run. Defaults to None for all.
+        verbose (bool, optional): Whether to print each result. Defaults to True.
+
+    Returns:
+        Dict[str, Any]: The metadata and a record per benchmark and size.
+    """
+    names = [
+        name
+        for name in BENCHMARKS
+        if patterns is None
+        or any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+    ]
+    records = []
+    for n_codes, n_bars in sizes:
+        data = MarketData(n_codes, n_bars, missing_rate, seed)
+        for name in names:
+            record = {
+                "name": name,
+                **data.params,
+                **measure(BENCHMARKS[name], data, repeat),
+            }
+            records.append(record)
+            if verbose:
+                print(
+                    f"{name:<45} codes={n_codes:<6} bars={n_bars:<6} "
+                    f"median={record['median_s'] * 1e3:10.3f} ms "
+                    f"peak={record['peak_bytes'] / 2**20:9.2f} MiB"
+                )
+    return {"metadata": get_metadata(), "results": records}
+
+
+def write_results(results: Dict[str, Any], path: str) -> None:
+    """
+    Write benchmark results to a JSON file.
+
+    Args:
+        results (Dict[str, Any]): The results of `run_benchmarks`.
+        path (str): The file path.
+    """
+    with open(path, "w") as file:
+        json.dump(results, file, indent=2)
+
+
+def read_results(path: str) -> Dict[str, Any]:
+    """
+    Read benchmark results from a JSON file.
+
+    Args:
+        path (str): The file path.
+
+    Returns:
+        Dict[str, Any]: The results.
+    """
+    with open(path) as file:
+        return json.load(file)
+
+
+def compare_results(
+    base: Dict[str, Any], head: Dict[str, Any]
+) -> pd.DataFrame:
+    """
+    Compare two benchmark results matched by name and market parameters.
+
+    Args:
+        base (Dict[str, Any]): The results of the reference version.
+        head (Dict[str, Any]): The results of the version under test.
+
+    Returns:
+        pd.DataFrame: The median times and peak allocations of both, with their head / base ratios.
+    """
+    keys = ["name", "n_codes", "n_bars", "missing_rate", "seed"]
+    columns = [*keys, "median_s", "peak_bytes"]
+    base_df = pd.DataFrame(base["results"])[columns]
+    head_df = pd.DataFrame(head["results"])[columns]
+    comparison_df = base_df.merge(
+        head_df, on=keys, suffixes=("_base", "_head")
+    )
+    comparison_df["time_ratio"] = (
+        comparison_df["median_s_head"] / comparison_df["median_s_base"]
+    )
+    comparison_df["memory_ratio"] = comparison_df[
+        "peak_bytes_head"
+    ] / comparison_df["peak_bytes_base"].replace(0, np.nan)
+    return comparison_df.set_index(keys)
@@ -0,0 +1,348 @@
+from typing import Any, Callable, Dict
+import numpy as np
+import pandas as pd
+
+from OhlcvAnalyser import MultiOhlcvAnalyser, SingleOhlcvAnalyser
+from OhlcvAnalyser.analyser import PriceAnalyser
+
+from .market import make_multi_ohlcv, make_single_ohlcv
+
+
+class MarketData:
+    def __init__(
+        self,
+        n_codes: int,
+        n_bars: int,
+        missing_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        """
+        The synthetic data shared by the benchmarks of one market size.
+
+        The query window covers the middle half of the dates, and the last
+        tenth of the bars is held back as new bars for the append benchmarks.
+
+        Args:
+            n_codes (int): The number of codes.
+            n_bars (int): The number of bars per code.
+            missing_rate (float, optional): The probability of dropping each bar. Defaults to 0.0.
+            seed (int, optional): The random seed. Defaults to 0.
+        """
+        self.params = {
+            "n_codes": n_codes,
+            "n_bars": n_bars,
+            "missing_rate": missing_rate,
+            "seed": seed,
+        }
+        multi_ohlcv = make_multi_ohlcv(n_codes, n_bars, missing_rate, seed)
+        single_ohlcv = make_single_ohlcv(n_bars, missing_rate, seed)
+        dates = multi_ohlcv.index.unique()
+        split_date = dates[int(len(dates) * 0.9)]
+        self.multi_ohlcv = multi_ohlcv[multi_ohlcv.index < split_date]
+        self.new_multi_bars = multi_ohlcv[multi_ohlcv.index >= split_date]
+        self.single_ohlcv = single_ohlcv[single_ohlcv.index < split_date]
+        self.new_single_bars = single_ohlcv[single_ohlcv.index >= split_date]
+        self.start = dates[len(dates) // 4]
+        self.end = dates[len(dates) * 3 // 4]
+
+
+# Benchmark name -> setup, which prepares cold state outside of the timing
+# and returns the call to time
+BENCHMARKS: Dict[str, Callable[[MarketData], Callable[[], Any]]] = {}
+
+
+def benchmark(name: str) -> Callable:
+    """
+    Register a benchmark setup under a name.
+
+    Args:
+        name (str): The benchmark name.
+
+    Returns:
+        Callable: The decorator registering the setup.
+    """
+
+    def register(setup: Callable) -> Callable:
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+def _register_multi_method(method: str, args: tuple) -> None:
+    """
+    Register full-range and windowed benchmarks of a MultiOhlcvAnalyser
+    method on a freshly built analyser.
+
+    Args:
+        method (str): The method name.
+        args (tuple): The positional arguments before start and end.
+    """
+
+    def setup_full(data: MarketData) -> Callable[[], Any]:
+        analyser = MultiOhlcvAnalyser(data.multi_ohlcv)
+        return lambda: getattr(analyser, method)(*args)
+
+    def setup_window(data: MarketData) -> Callable[[], Any]:
+        analyser = MultiOhlcvAnalyser(data.multi_ohlcv)
+        return lambda: getattr(analyser, method)(*args, data.start, data.end)
+
+    benchmark(f"multi.{method}")(setup_full)
+    benchmark(f"multi.{method}.window")(setup_window)
+
+
+for _method, _args in [
+    ("info", ()),
+    ("coef", ("close",)),
+    ("normalized_coef", ("close",)),
+    ("coef_score", ("close",)),
+    ("oc_variance", ()),
+    ("hl_variance", ()),
+    ("profit", ("close",)),
+    ("max_profit", ()),
+    ("min_profit", ()),
+    ("max_drawdown", ()),
+    ("summary", ()),
+]:
+    _register_multi_method(_method, _args)
+
+
+@benchmark("multi.init")
+def setup_multi_init(data: MarketData) -> Callable[[], Any]:
+    return lambda: MultiOhlcvAnalyser(data.multi_ohlcv)
+
+
+@benchmark("multi.screen.window")
+def setup_multi_screen(data: MarketData) -> Callable[[], Any]:
+    analyser = MultiOhlcvAnalyser(data.multi_ohlcv)
+    filters = {"close_coef_score": (0.5, None), "profit": (0, None)}
+    return lambda: analyser.screen(
+        "close_normalized_coef", 50, filters, data.start, data.end
+    )
+
+
+@benchmark("multi.append")
+def setup_multi_append(data: MarketData) -> Callable[[], Any]:
+    analyser = MultiOhlcvAnalyser(data.multi_ohlcv)
+    analyser.info()
+
+    def run() -> pd.DataFrame:
+        analyser.append(data.new_multi_bars)
+        return analyser.info()
+
+    return run
+
+
+@benchmark("multi.at.coef")
+def setup_multi_at_coef(data: MarketData) -> Callable[[], Any]:
+    analyser = MultiOhlcvAnalyser(data.multi_ohlcv)
+    return lambda: analyser.at("W").coef("close", data.start, data.end)
+
+
+@benchmark("resample_ohlcv")
+def setup_resample_ohlcv(data: MarketData) -> Callable[[], Any]:
+    from OhlcvAnalyser.utils import resample_ohlcv
+
+    return lambda: resample_ohlcv(data.multi_ohlcv, "W")
+
+
+@benchmark("single.info")
+def setup_single_info(data: MarketData) -> Callable[[], Any]:
+    analyser = SingleOhlcvAnalyser(data.single_ohlcv)
+    return analyser.info
+
+
+@benchmark("single.info.window")
+def setup_single_info_window(data: MarketData) -> Callable[[], Any]:
+    analyser = SingleOhlcvAnalyser(data.single_ohlcv)
+    return lambda: analyser.info(data.start, data.end)
+
+
+@benchmark("single.append")
+def setup_single_append(data: MarketData) -> Callable[[], Any]:
+    analyser = SingleOhlcvAnalyser(data.single_ohlcv)
+    analyser.info()
+
+    def run() -> pd.DataFrame:
+        analyser.append(data.new_single_bars)
+        return analyser.info()
+
+    return run
+
+
+@benchmark("single.get_price_rank_series")
+def setup_single_price_rank(data: MarketData) -> Callable[[], Any]:
+    analyser = SingleOhlcvAnalyser(data.single_ohlcv)
+    price = float(data.single_ohlcv["close"].median())
+    return lambda: analyser.get_price_rank_series(
+        data.start, data.end, price, seed=0
+    )
+
+
+@benchmark("single.get_price_rank_series.analytic")
+def setup_single_analytic_price_rank(data: MarketData) -> Callable[[], Any]:
+    analyser = SingleOhlcvAnalyser(data.single_ohlcv)
+    price = float(data.single_ohlcv["close"].median())
+    return lambda: analyser.get_price_rank_series(
+        data.start, data.end, price, method="analytic"
+    )
+
+
+@benchmark("single.get_price_rank_df")
+def setup_single_price_rank_df(data: MarketData) -> Callable[[], Any]:
+    analyser = SingleOhlcvAnalyser(data.single_ohlcv)
+    prices = np.quantile(data.single_ohlcv["close"], np.linspace(0, 1, 100))
+    queries = pd.DataFrame(
+        {"start": data.start, "end": data.end, "price": prices}
+    )
+    return lambda: analyser.get_price_rank_df(queries, seed=0)
+
+
+@benchmark("single.get_coefficient_series")
+def setup_single_coefficient(data: MarketData) -> Callable[[], Any]:
+    analyser = SingleOhlcvAnalyser(data.single_ohlcv)
+    return lambda: analyser.get_coefficient_series(
+        "close", data.start, data.end
+    )
+
+
+@benchmark("single.rolling_coefficient")
+def setup_single_rolling_coefficient(
+    data: MarketData,
+) -> Callable[[], Any]:
+    analyser = SingleOhlcvAnalyser(data.single_ohlcv)
+    return lambda: analyser.rolling_coefficient("close", 20)
+
+
+@benchmark("price.get_general_prices")
+def setup_general_prices(data: MarketData) -> Callable[[], Any]:
+    ohlcv = data.single_ohlcv
+    return lambda: PriceAnalyser.get_general_prices(
+        ohlcv["close"], ohlcv["volume"]
+    )
+
+
+@benchmark("price.get_statistical_prices")
+def setup_statistical_prices(data: MarketData) -> Callable[[], Any]:
+    ohlcv = data.single_ohlcv
+    return lambda: PriceAnalyser.get_statistical_prices(
+        ohlcv["high"], ohlcv["low"], ohlcv["volume"], seed=0
+    )
+
+
+@benchmark("price.get_price_rank")
+def setup_price_rank(data: MarketData) -> Callable[[], Any]:
+    ohlcv = data.single_ohlcv
+    prices = PriceAnalyser.get_statistical_prices(
+        ohlcv["high"], ohlcv["low"], ohlcv["volume"], seed=0
+    )
+    price = float(np.median(prices))
+    return lambda: PriceAnalyser.get_price_rank(prices, price)
+
+
+@benchmark("price.get_price_ranks")
+def setup_price_ranks(data: MarketData) -> Callable[[], Any]:
+    ohlcv = data.single_ohlcv
+    sorted_prices = np.sort(
+        PriceAnalyser.get_statistical_prices(
+            ohlcv["high"], ohlcv["low"], ohlcv["volume"], seed=0
+        )
+    )
+    prices = np.quantile(sorted_prices, np.linspace(0, 1, 1000))
+    return lambda: PriceAnalyser.get_price_ranks(sorted_prices, prices)
+
+
+@benchmark("price.get_analytic_mean_price")
+def setup_analytic_mean_price(data: MarketData) -> Callable[[], Any]:
+    ohlcv = data.single_ohlcv
+    return lambda: PriceAnalyser.get_analytic_mean_price(
+        ohlcv["high"], ohlcv["low"], ohlcv["volume"]
+    )
+
+
+@benchmark("price.get_analytic_price_rank")
+def setup_analytic_price_rank(data: MarketData) -> Callable[[], Any]:
+    ohlcv = data.single_ohlcv
+    price = float(ohlcv["close"].median())
+    return lambda: PriceAnalyser.get_analytic_price_rank(
+        ohlcv["high"], ohlcv["low"], ohlcv["volume"], price
+    )
+
+
+def _get_plot_axes():
+    """
+    Get fresh axes on the non-interactive Agg backend, closing the figures
+    of earlier runs. The plot benchmarks render the figure, as drawing the
+    artists dominates the cost of large plots.
+
+    Returns:
+        plt.Axes: The axes.
+    """
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    plt.close("all")
+    _, ax = plt.subplots()
+    return ax
+
+
+def _render(ax) -> None:
+    """
+    Render the figure of plotted axes.
+
+    Args:
+        ax (plt.Axes): The plotted axes.
+    """
+    ax.figure.canvas.draw()
+
+
+@benchmark("plotter.general_ohlcv_plot")
+def setup_general_ohlcv_plot(data: MarketData) -> Callable[[], Any]:
+    from OhlcvAnalyser.plotter import Plotter
+
+    ax = _get_plot_axes()
+    return lambda: _render(Plotter.general_ohlcv_plot(ax, data.single_ohlcv))
+
+
+@benchmark("plotter.draw_regression_plot")
+def setup_draw_regression_plot(data: MarketData) -> Callable[[], Any]:
+    from OhlcvAnalyser.plotter import Plotter
+
+    ax = _get_plot_axes()
+    return lambda: _render(
+        Plotter.draw_regression_plot(ax, data.single_ohlcv, 4)
+    )
+
+
+@benchmark("plotter.general_ohlcv_plot.fast")
+def setup_fast_general_ohlcv_plot(data: MarketData) -> Callable[[], Any]:
+    from OhlcvAnalyser.plotter import Plotter
+
+    ax = _get_plot_axes()
+    return lambda: _render(
+        Plotter.general_ohlcv_plot(ax, data.single_ohlcv, fast=True)
+    )
+
+
+@benchmark("plotter.draw_regression_plot.fast")
+def setup_fast_draw_regression_plot(data: MarketData) -> Callable[[], Any]:
+    from OhlcvAnalyser.plotter import Plotter
+
+    ax = _get_plot_axes()
+    return lambda: _render(
+        Plotter.draw_regression_plot(ax, data.single_ohlcv, 4, fast=True)
+    )
+
+
+@benchmark("plotter.render_charts")
+def setup_render_charts(data: MarketData) -> Callable[[], Any]:
+    import tempfile
+
+    from OhlcvAnalyser.plotter import render_charts
+
+    analyser = MultiOhlcvAnalyser(data.multi_ohlcv)
+    codes = list(data.multi_ohlcv["code"].unique()[:10])
+    output_dir = tempfile.mkdtemp()
+    return lambda: render_charts(analyser, output_dir, codes)